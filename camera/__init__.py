@@ -0,0 +1,3 @@
+"""
+相机预设模块
+"""
@@ -0,0 +1,174 @@
+"""
+实验相机预设
+以数据形式集中保存各实验的相机参数，由 apply_camera_preset 统一写入 USD
+"""
+import carb
+import omni.usd
+import omni.kit.viewport.utility as vp_util
+from pxr import Gf, Sdf, UsdGeom
+
+# 视口没有活动相机时使用的默认透视相机
+DEFAULT_CAMERA_PATH = "/OmniverseKit_Persp"
+
+# 所有实验共用的相机参数
+DEFAULT_CLIPPING_RANGE = (0.009999999776482582, 10000000.0)
+DEFAULT_FOCAL_LENGTH = 18.14756202697754
+
+# 各实验的相机位姿：translate 为 (x, y, z)，orient 为四元数 (w, x, y, z)
+CAMERA_PRESETS = {
+    "1": {
+        "translate": (3.5422114387995194, 4.789534293747461, 2.734575842472313),
+        "orient": (0.2293882119384616, 0.14807866885692916, 0.5217433897762196, 0.8082311496583482),
+    },
+    "2": {
+        "translate": (1.169913776980235, 5.384567671926622, 2.5526077469676727),
+        "orient": (0.014359612064957861, 0.009788101829553237, 0.5631514231667778, 0.8261709684981379),
+    },
+}
+
+# 预设值在模块加载时一次性转换为 Gf 对象，写入时直接复用
+_GF_PRESETS = {
+    experiment_id: (Gf.Vec3d(*preset["translate"]), Gf.Quatd(*preset["orient"]))
+    for experiment_id, preset in CAMERA_PRESETS.items()
+}
+_GF_CLIPPING_RANGE = Gf.Vec2f(*DEFAULT_CLIPPING_RANGE)
+
+
+# xformOp 名称 -> (操作类型, 创建方法名)
+_XFORM_OP_KINDS = {
+    "translate": (UsdGeom.XformOp.TypeTranslate, "AddTranslateOp"),
+    "orient": (UsdGeom.XformOp.TypeOrient, "AddOrientOp"),
+    "rotateXYZ": (UsdGeom.XformOp.TypeRotateXYZ, "AddRotateXYZOp"),
+    "rotateY": (UsdGeom.XformOp.TypeRotateY, "AddRotateYOp"),
+}
+
+
+def get_or_create_xform_ops(xform: UsdGeom.Xformable, want: tuple) -> dict:
+    """
+    获取指定类型的 xformOp，已存在则复用，不存在才创建
+
+    避免 ClearXformOpOrder + Add*Op 每次都新建属性、使变换缓存失效
+
+    Args:
+        xform: 目标 Xformable
+        want: 需要的操作名称，如 ("translate", "orient")
+
+    Returns:
+        {操作名称: UsdGeom.XformOp}
+    """
+    wanted_types = {_XFORM_OP_KINDS[name][0]: name for name in want}
+    ops = {}
+    for op in xform.GetOrderedXformOps():
+        name = wanted_types.get(op.GetOpType())
+        if name is not None:
+            ops[name] = op
+
+    for name in want:
+        if name not in ops:
+            ops[name] = getattr(xform, _XFORM_OP_KINDS[name][1])()
+    return ops
+
+
+# 相机 schema 包装对象缓存：{相机路径: (UsdGeom.Camera, UsdGeom.Xformable)}
+# 只保存当前 stage 的条目，stage 切换时整体清空
+_camera_handle_cache = {}
+_camera_cache_stage_id = None
+
+
+def _get_camera_handles(stage, stage_id: int, camera_path: str):
+    """获取（必要时创建并缓存）相机的 Camera / Xformable 包装对象，相机不存在时返回 None"""
+    global _camera_cache_stage_id
+    if stage_id != _camera_cache_stage_id:
+        _camera_handle_cache.clear()
+        _camera_cache_stage_id = stage_id
+
+    handles = _camera_handle_cache.get(camera_path)
+    if handles is not None and handles[0].GetPrim().IsValid():
+        return handles
+
+    camera_prim = stage.GetPrimAtPath(camera_path)
+    if not camera_prim.IsValid():
+        _camera_handle_cache.pop(camera_path, None)
+        return None
+
+    handles = (UsdGeom.Camera(camera_prim), UsdGeom.Xformable(camera_prim))
+    _camera_handle_cache[camera_path] = handles
+    return handles
+
+
+def clear_camera_cache():
+    """清空相机包装对象缓存（例如重新加载 stage 后）"""
+    global _camera_cache_stage_id
+    _camera_handle_cache.clear()
+    _camera_cache_stage_id = None
+
+
+def _value_changed(current, value, eps: float = 1e-6) -> bool:
+    """比较属性当前值与目标值（标量或向量），未设置或差值超过 eps 时返回 True"""
+    if current is None:
+        return True
+    if isinstance(value, float):
+        return abs(current - value) > eps
+    return any(abs(c - v) > eps for c, v in zip(current, value))
+
+
+def apply_camera_preset(experiment_id: str, stage=None) -> bool:
+    """
+    将指定实验的相机预设写入当前活动相机
+
+    Args:
+        experiment_id: 实验编号（CAMERA_PRESETS 的键）
+        stage: 调用方已获取的当前 stage，为 None 时自动获取
+
+    Returns:
+        是否成功写入相机参数
+    """
+    usd_context = omni.usd.get_context()
+    stage = stage or usd_context.get_stage()
+    if not stage:
+        carb.log_error("💥 No USD stage available!")
+        return False
+
+    # 获取活动相机
+    viewport = vp_util.get_active_viewport()
+    camera_path = viewport.get_active_camera() if viewport else DEFAULT_CAMERA_PATH
+    carb.log_warn(f"📷 Using camera: {camera_path}")
+
+    handles = _get_camera_handles(stage, usd_context.get_stage_id(), str(camera_path))
+    if handles is None:
+        carb.log_error(f"💥 Camera not found: {camera_path}")
+        return False
+
+    camera, xform = handles
+    ops = get_or_create_xform_ops(xform, ("translate", "orient"))
+    translate_op = ops["translate"]
+    orient_op = ops["orient"]
+
+    preset = _GF_PRESETS.get(experiment_id)
+
+    # 先在 ChangeBlock 外读取当前值，只写入确实发生变化的属性
+    writes = []
+    if preset:
+        if _value_changed(translate_op.Get(), preset[0]):
+            writes.append((translate_op, preset[0]))
+        writes.append((orient_op, preset[1]))
+
+    # 设置通用相机参数
+    clipping_attr = camera.GetClippingRangeAttr()
+    if _value_changed(clipping_attr.Get(), DEFAULT_CLIPPING_RANGE):
+        writes.append((clipping_attr, _GF_CLIPPING_RANGE))
+    focal_attr = camera.GetFocalLengthAttr()
+    if _value_changed(focal_attr.Get(), DEFAULT_FOCAL_LENGTH):
+        writes.append((focal_attr, DEFAULT_FOCAL_LENGTH))
+
+    # 所有写入放在同一个 ChangeBlock 中，合并为一次变更通知
+    if writes:
+        with Sdf.ChangeBlock():
+            for attr, value in writes:
+                attr.Set(value)
+
+    if preset:
+        carb.log_warn(f"📷 Applied camera params for Experiment {experiment_id}")
+    else:
+        carb.log_warn(f"⚠️ No camera params defined for experiment {experiment_id}, using default")
+    return True
@@ -4,6 +4,7 @@
 集中管理所有配置项，避免硬编码
 """
 import os
+import functools
 
 # ============================================================
 # 路径配置
@@ -24,9 +25,13 @@ DEFAULT_USD_PATH = os.getenv(
 )
 
 
-# 日志目录
-LOG_DIR = os.path.join(PROJECT_ROOT, "logs")
-os.makedirs(LOG_DIR, exist_ok=True)
+# 日志目录（首次使用时才创建，保证 import config 没有副作用）
+@functools.lru_cache(maxsize=1)
+def get_log_dir() -> str:
+    """返回日志目录路径，不存在时自动创建"""
+    log_dir = os.path.join(PROJECT_ROOT, "logs")
+    os.makedirs(log_dir, exist_ok=True)
+    return log_dir
 
 # ============================================================
 # 服务器配置
@@ -45,6 +50,13 @@ VIDEO_WIDTH = 2560
 VIDEO_HEIGHT = 1440
 VIDEO_FPS = 30
 
+# ============================================================
+# 相机配置
+# ============================================================
+DEFAULT_CAMERA_DISTANCE = 10.0
+DEFAULT_CAMERA_AZIMUTH = 45.0
+DEFAULT_CAMERA_ELEVATION = 30.0
+
 # ============================================================
 # 监控与遥测配置 (关键修改)
 # ============================================================
@@ -54,6 +66,11 @@ STATE_BROADCAST_INTERVAL = 2.0
 # 修复：提高遥测频率到 0.01 (100Hz)，确保高速采样，减少波动
 TELEMETRY_BROADCAST_INTERVAL = 0.01 
 
+# 遥测批量发送：采样仍按上面的间隔进行，但累积到 TELEMETRY_MAX_BATCH 个样本
+# 或距第一个样本超过 TELEMETRY_MAX_DELAY 秒时才合并为一条 WebSocket 消息发送
+TELEMETRY_MAX_BATCH = 20
+TELEMETRY_MAX_DELAY = 0.05
+
 DEBOUNCE_WINDOW = 0.5
 
 # ============================================================
@@ -0,0 +1,47 @@
+"""
+Math Kernels
+Small numeric helpers on the camera hot path, compiled with numba when available
+"""
+
+import math
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """Fallback decorator - returns the plain Python function"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+_DEG_TO_RAD = 0.017453292519943295
+
+
+@njit(cache=True, fastmath=True)
+def sph_to_cart(distance, azimuth_deg, elevation_deg):
+    """
+    Convert spherical camera coordinates to a cartesian offset
+
+    Args:
+        distance: Distance from the target
+        azimuth_deg: Azimuth angle in degrees
+        elevation_deg: Elevation angle in degrees
+
+    Returns:
+        (x, y, z) offset from the target
+    """
+    azimuth_rad = azimuth_deg * _DEG_TO_RAD
+    elevation_rad = elevation_deg * _DEG_TO_RAD
+    cos_el = math.cos(elevation_rad)
+    return (
+        distance * cos_el * math.cos(azimuth_rad),
+        distance * cos_el * math.sin(azimuth_rad),
+        distance * math.sin(elevation_rad)
+    )
+
+
+# Compile (or load from cache) at import so the first camera update doesn't pay for it
+sph_to_cart(1.0, 0.0, 0.0)
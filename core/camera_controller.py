@@ -5,7 +5,9 @@ Handles camera orbit, pan, zoom, and reset operations
 """
 
 import math
+import weakref
 import carb
+import omni.kit.app
 import omni.kit.viewport.utility as vp_util
 import omni.usd
 from pxr import Gf, UsdGeom
@@ -17,6 +19,27 @@ from config import (
     DEFAULT_CAMERA_ELEVATION
 )
 from utils.logging_helper import camera_logger
+from ._math_kernels import _DEG_TO_RAD, sph_to_cart
+
+
+def _weak_callback(method):
+    """
+    Wrap a bound method so an event subscription does not keep its owner alive
+
+    Args:
+        method: Bound method to call
+
+    Returns:
+        Callback that forwards the event while the owner exists
+    """
+    ref = weakref.WeakMethod(method)
+
+    def callback(event):
+        func = ref()
+        if func is not None:
+            func(event)
+
+    return callback
 
 
 class CameraController:
@@ -25,6 +48,15 @@ class CameraController:
     Supports orbit, pan, zoom operations with custom camera locking
     """
 
+    __slots__ = (
+        "camera_distance", "camera_azimuth", "camera_elevation", "camera_target",
+        "orbit_speed", "pan_speed", "zoom_speed", "use_custom_camera",
+        "_trig_dirty", "_sin_az", "_cos_az", "_dirty", "_app_sub",
+        "_stage", "_stage_sub",
+        "_cached_camera_path", "_cached_translate_op", "_cached_rotate_op", "_fast_update",
+        "_last_applied", "_state_dict", "__weakref__",
+    )
+
     def __init__(
         self,
         distance: float = DEFAULT_CAMERA_DISTANCE,
@@ -52,6 +84,43 @@ class CameraController:
         # Custom camera lock (prevents automatic updates)
         self.use_custom_camera = False
 
+        # Cached sin/cos of azimuth (refreshed when the angle changes)
+        self._trig_dirty = True
+        self._sin_az = 0.0
+        self._cos_az = 1.0
+
+        # Pending camera changes are written to USD once per app update
+        # (subscriptions hold weak callbacks, so dropping the controller releases them)
+        self._dirty = False
+        self._app_sub = omni.kit.app.get_app().get_update_event_stream().create_subscription_to_pop(
+            _weak_callback(self._on_update)
+        )
+
+        # Cached USD stage, dropped on stage open/close events
+        self._stage = None
+        self._stage_sub = omni.usd.get_context().get_stage_event_stream().create_subscription_to_pop(
+            _weak_callback(self._on_stage_event), name="CameraController stage events"
+        )
+
+        # Cached xform ops of the active camera prim
+        self._cached_camera_path = None
+        self._cached_translate_op = None
+        self._cached_rotate_op = None
+        # Pose writer specialized for the cached ops (see _compile_fast_path)
+        self._fast_update = None
+
+        # State key of the last pose written to USD (skips no-op updates)
+        self._last_applied = None
+
+        # Reused get_state() result, updated in place on each call
+        self._state_dict = {
+            "distance": 0.0,
+            "azimuth": 0.0,
+            "elevation": 0.0,
+            "target": {"x": 0.0, "y": 0.0, "z": 0.0},
+            "locked": False
+        }
+
         camera_logger.info(
             f"Camera controller initialized: "
             f"distance={distance}, azimuth={azimuth}, elevation={elevation}"
@@ -68,7 +137,8 @@ class CameraController:
         self.camera_azimuth += delta_x * self.orbit_speed
         self.camera_elevation = max(-89, min(89, self.camera_elevation + delta_y * self.orbit_speed))
         self.camera_azimuth = self.camera_azimuth % 360
-        self._update_camera()
+        self._trig_dirty = True
+        self._dirty = True
 
     def pan(self, delta_x: float, delta_y: float):
         """
@@ -78,12 +148,17 @@ class CameraController:
             delta_x: Horizontal pan delta
             delta_y: Vertical pan delta
         """
-        azimuth_rad = math.radians(self.camera_azimuth)
-        right = Gf.Vec3d(-math.sin(azimuth_rad), math.cos(azimuth_rad), 0)
-        up = Gf.Vec3d(0, 0, 1)
-        self.camera_target += right * delta_x * self.pan_speed
-        self.camera_target += up * delta_y * self.pan_speed
-        self._update_camera()
+        self._refresh_trig()
+        # Move along the camera's right vector (-sin_az, cos_az, 0) and world up,
+        # in plain floats so only one Gf.Vec3d is allocated per call
+        step_x = delta_x * self.pan_speed
+        target = self.camera_target
+        self.camera_target = Gf.Vec3d(
+            target[0] - self._sin_az * step_x,
+            target[1] + self._cos_az * step_x,
+            target[2] + delta_y * self.pan_speed
+        )
+        self._dirty = True
 
     def zoom(self, delta: float):
         """
@@ -93,7 +168,7 @@ class CameraController:
             delta: Zoom delta (positive = zoom out, negative = zoom in)
         """
         self.camera_distance = max(1.0, self.camera_distance + delta * self.zoom_speed)
-        self._update_camera()
+        self._dirty = True
 
     def reset(self):
         """Reset camera to default position"""
@@ -101,7 +176,8 @@ class CameraController:
         self.camera_azimuth = DEFAULT_CAMERA_AZIMUTH
         self.camera_elevation = DEFAULT_CAMERA_ELEVATION
         self.camera_target = Gf.Vec3d(0, 0, 0)
-        self._update_camera()
+        self._trig_dirty = True
+        self._dirty = True
         camera_logger.info("Camera reset to default position")
 
     def lock_camera(self, locked: bool = True):
@@ -115,8 +191,145 @@ class CameraController:
         if locked:
             camera_logger.info("Camera locked (custom camera mode)")
         else:
+            # Ops may have been edited while locked
+            self.invalidate_camera_cache()
             camera_logger.info("Camera unlocked (automatic mode)")
 
+    def shutdown(self):
+        """Release the app update and stage event subscriptions"""
+        self._app_sub = None
+        self._stage_sub = None
+        self._stage = None
+
+    def __del__(self):
+        """Release subscriptions when the controller is garbage collected"""
+        self.shutdown()
+
+    def _on_stage_event(self, event):
+        """
+        Stage event callback - drops the cached stage and ops when the stage changes
+
+        Args:
+            event: USD stage event
+        """
+        if event.type in (int(omni.usd.StageEventType.OPENED), int(omni.usd.StageEventType.CLOSED)):
+            self._stage = None
+            self.invalidate_camera_cache()
+
+    def _on_update(self, event):
+        """
+        App update callback - applies accumulated camera changes once per frame
+
+        Args:
+            event: Kit update event
+        """
+        if self._dirty and not self.use_custom_camera:
+            self._update_camera()
+            self._dirty = False
+
+    def _refresh_trig(self):
+        """Recompute cached sin/cos of azimuth if the angle changed"""
+        if not self._trig_dirty:
+            return
+
+        azimuth_rad = self.camera_azimuth * _DEG_TO_RAD
+        self._sin_az = math.sin(azimuth_rad)
+        self._cos_az = math.cos(azimuth_rad)
+        self._trig_dirty = False
+
+    def _get_xform_ops(self, camera_path):
+        """
+        Get the translate/rotateXYZ ops of the camera prim
+        Ops are cached per camera path and only re-scanned when the path changes
+        or the cache is invalidated
+
+        Args:
+            camera_path: Active camera prim path
+
+        Returns:
+            (translate_op, rotation_op) or None if the camera prim is unavailable
+        """
+        if (
+            camera_path == self._cached_camera_path
+            and self._cached_translate_op is not None
+            and self._cached_translate_op.GetAttr().IsValid()
+            and self._cached_rotate_op.GetAttr().IsValid()
+        ):
+            return self._cached_translate_op, self._cached_rotate_op
+
+        # Get USD stage and camera prim
+        stage = self._stage or omni.usd.get_context().get_stage()
+        self._stage = stage
+        if not stage:
+            camera_logger.warn("USD stage not available", suppress=True)
+            return None
+
+        camera_prim = stage.GetPrimAtPath(camera_path)
+        if not camera_prim:
+            camera_logger.warn(f"Camera prim not found at {camera_path}", suppress=True)
+            return None
+
+        xformable = UsdGeom.Xformable(camera_prim)
+
+        # Find the first translation and rotation ops in one pass (avoid duplicate operations)
+        translate_op = rotation_op = None
+        for op in xformable.GetOrderedXformOps():
+            op_type = op.GetOpType()
+            if op_type == UsdGeom.XformOp.TypeTranslate and translate_op is None:
+                translate_op = op
+            elif op_type == UsdGeom.XformOp.TypeRotateXYZ and rotation_op is None:
+                rotation_op = op
+            if translate_op is not None and rotation_op is not None:
+                break
+
+        if translate_op is None:
+            translate_op = xformable.AddTranslateOp()
+        if rotation_op is None:
+            rotation_op = xformable.AddRotateXYZOp()
+
+        self._cached_camera_path = camera_path
+        self._cached_translate_op = translate_op
+        self._cached_rotate_op = rotation_op
+        self._fast_update = self._compile_fast_path(translate_op, rotation_op)
+        return translate_op, rotation_op
+
+    @staticmethod
+    def _compile_fast_path(translate_op, rotation_op):
+        """
+        Build a pose writer bound to the given xform ops
+
+        Everything except the pose itself is fixed until the camera changes, so the
+        op setters and Gf constructors are bound as default arguments (local lookups)
+
+        Args:
+            translate_op: Camera translate op
+            rotation_op: Camera rotateXYZ op
+
+        Returns:
+            Function (distance, azimuth, elevation, tx, ty, tz) -> None
+        """
+        def fast_update(
+            distance, azimuth, elevation, tx, ty, tz,
+            cart=sph_to_cart, vec3d=Gf.Vec3d, vec3f=Gf.Vec3f,
+            set_translate=translate_op.Set, set_rotate=rotation_op.Set
+        ):
+            x, y, z = cart(distance, azimuth, elevation)
+            set_translate(vec3d(tx + x, ty + y, tz + z))
+            # The camera always looks back along the spherical offset, so the view
+            # direction is -(cos_el*cos_az, cos_el*sin_az, sin_el): pitch equals the
+            # elevation and yaw is the azimuth turned by 180 degrees
+            set_rotate(vec3f(elevation, 0.0, (azimuth + 180.0) % 360.0 - 90.0))
+
+        return fast_update
+
+    def invalidate_camera_cache(self):
+        """Drop cached xform ops so the next update re-resolves the camera prim"""
+        self._cached_camera_path = None
+        self._cached_translate_op = None
+        self._cached_rotate_op = None
+        self._fast_update = None
+        self._last_applied = None
+
     def _update_camera(self):
         """
         Update camera position and orientation in the viewport
@@ -137,55 +350,23 @@ class CameraController:
                 camera_logger.warn("No active camera in viewport", suppress=True)
                 return
 
-            # Calculate camera position from spherical coordinates
-            azimuth_rad = math.radians(self.camera_azimuth)
-            elevation_rad = math.radians(self.camera_elevation)
-
-            x = self.camera_distance * math.cos(elevation_rad) * math.cos(azimuth_rad)
-            y = self.camera_distance * math.cos(elevation_rad) * math.sin(azimuth_rad)
-            z = self.camera_distance * math.sin(elevation_rad)
-
-            camera_pos = self.camera_target + Gf.Vec3d(x, y, z)
-
-            # Get USD stage and camera prim
-            stage = omni.usd.get_context().get_stage()
-            if not stage:
-                camera_logger.warn("USD stage not available", suppress=True)
+            # Skip the USD write if this pose was already applied to this camera
+            target = self.camera_target
+            key = (
+                camera_path,
+                self.camera_distance, self.camera_azimuth, self.camera_elevation,
+                target[0], target[1], target[2]
+            )
+            if key == self._last_applied:
                 return
 
-            camera_prim = stage.GetPrimAtPath(camera_path)
-            if not camera_prim:
-                camera_logger.warn(f"Camera prim not found at {camera_path}", suppress=True)
+            if self._get_xform_ops(camera_path) is None:
                 return
 
-            xformable = UsdGeom.Xformable(camera_prim)
-
-            # Set translation (avoid duplicate operations)
-            translate_ops = [
-                op for op in xformable.GetOrderedXformOps()
-                if op.GetOpType() == UsdGeom.XformOp.TypeTranslate
-            ]
-            if translate_ops:
-                translate_op = translate_ops[0]
-            else:
-                translate_op = xformable.AddTranslateOp()
-            translate_op.Set(camera_pos)
-
-            # Set rotation (avoid duplicate operations)
-            rotation_ops = [
-                op for op in xformable.GetOrderedXformOps()
-                if op.GetOpType() == UsdGeom.XformOp.TypeRotateXYZ
-            ]
-            if rotation_ops:
-                rotation_op = rotation_ops[0]
-            else:
-                rotation_op = xformable.AddRotateXYZOp()
-
-            # Calculate view direction and rotation
-            view_dir = (self.camera_target - camera_pos).GetNormalized()
-            pitch = math.degrees(math.asin(-view_dir[2]))
-            yaw = math.degrees(math.atan2(view_dir[1], view_dir[0]))
-            rotation_op.Set(Gf.Vec3f(pitch, 0, yaw - 90))
+            # Write position (from spherical coordinates) and rotation
+            self._fast_update(*key[1:])
+
+            self._last_applied = key
 
         except Exception as e:
             camera_logger.error(f"Camera update failed: {e}", suppress=True)
@@ -194,20 +375,23 @@ class CameraController:
         """
         Get current camera state
 
+        The same dictionary is updated and returned on every call;
+        copy it if it needs to be kept
+
         Returns:
             Dictionary with camera parameters
         """
-        return {
-            "distance": self.camera_distance,
-            "azimuth": self.camera_azimuth,
-            "elevation": self.camera_elevation,
-            "target": {
-                "x": self.camera_target[0],
-                "y": self.camera_target[1],
-                "z": self.camera_target[2]
-            },
-            "locked": self.use_custom_camera
-        }
+        state = self._state_dict
+        state["distance"] = self.camera_distance
+        state["azimuth"] = self.camera_azimuth
+        state["elevation"] = self.camera_elevation
+        target = state["target"]
+        camera_target = self.camera_target
+        target["x"] = camera_target[0]
+        target["y"] = camera_target[1]
+        target["z"] = camera_target[2]
+        state["locked"] = self.use_custom_camera
+        return state
 
     def set_state(self, state: dict):
         """
@@ -221,12 +405,16 @@ class CameraController:
         if "azimuth" in state:
             self.camera_azimuth = state["azimuth"]
         if "elevation" in state:
-            self.camera_elevation = state["elevation"]
+            # Same limits as orbit(); the closed-form rotation in _compile_fast_path
+            # assumes |elevation| < 90
+            self.camera_elevation = max(-89, min(89, state["elevation"]))
+        if "azimuth" in state or "elevation" in state:
+            self._trig_dirty = True
         if "target" in state:
             t = state["target"]
             self.camera_target = Gf.Vec3d(t.get("x", 0), t.get("y", 0), t.get("z", 0))
         if "locked" in state:
             self.use_custom_camera = state["locked"]
 
-        self._update_camera()
+        self._dirty = True
         camera_logger.info(f"Camera state updated: {state}")
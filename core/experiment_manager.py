@@ -1,15 +1,22 @@
 
 import asyncio
-import math
-import os
+import numpy as np
 import omni.usd
 import omni.timeline
-from pxr import UsdGeom, Gf, UsdPhysics
-import omni.kit.viewport.utility as vp_util
+import omni.kit.app
+from pxr import Sdf, UsdPhysics
 from typing import Optional, Tuple
 
+try:
+    from omni.isaac.dynamic_control import _dynamic_control
+    _INVALID_HANDLE = _dynamic_control.INVALID_HANDLE
+except ImportError:
+    _dynamic_control = None
+    _INVALID_HANDLE = -1
+
 import config
 from utils.logging_helper import server_logger
+from .camera_controller import _weak_callback
 
 class ExperimentManager:
     """
@@ -29,47 +36,143 @@ class ExperimentManager:
         self._dc_interface = None
         self._disk_handle = None
         self._ring_handle = None
+
+        # 批量读取速度用的 RigidPrimView（不可用时回退到 DC 逐个读取）
+        self._body_view = None
+        self._disk_view_idx = 0
+        self._ring_view_idx = 0
+
+        # 最近一次角速度读数及其对应的 timeline 时间（同一物理时刻内复用）
+        self._timeline = omni.timeline.get_timeline_interface()
+        self._last_vel_time = None
+        self._last_vel = (0.0, 0.0)
+
+        # get_angular_velocities_np 复用的输出缓冲区 [ring, disk]
+        self._w_buf = np.zeros(2, dtype=np.float64)
         
         # 标记是否需要重新获取句柄
         self._dirty_handles = True
 
+        # 质量属性缓存 {prim 路径: UsdAttribute}，首次写入时 Apply MassAPI
+        self._mass_attrs = {}
+
+        # 仅在 stage 打开/加载/关闭时使句柄失效（修改质量不会使刚体句柄失效）
+        # 回调只持有弱引用，订阅不会让管理器一直存活
+        self._stage_event_sub = omni.usd.get_context().get_stage_event_stream().create_subscription_to_pop(
+            _weak_callback(self._on_stage_event), name="ExperimentManager stage events"
+        )
+
         server_logger.info("Experiment manager initialized")
 
+    def shutdown(self):
+        """释放 stage 事件订阅"""
+        self._stage_event_sub = None
+
+    def __del__(self):
+        """被垃圾回收时释放订阅"""
+        self.shutdown()
+
+    def _on_stage_event(self, event):
+        """stage 事件回调：场景变化后标记句柄需要刷新"""
+        if event.type in (
+            int(omni.usd.StageEventType.OPENED),
+            int(omni.usd.StageEventType.ASSETS_LOADED),
+            int(omni.usd.StageEventType.CLOSED),
+        ):
+            self._dirty_handles = True
+            self._mass_attrs.clear()
+
     def _initialize_dc_interface(self):
         """初始化 DC 接口"""
         if not self._dc_interface:
-            try:
-                from omni.isaac.dynamic_control import _dynamic_control
-                self._dc_interface = _dynamic_control.acquire_dynamic_control_interface()
-            except ImportError:
+            if _dynamic_control is None:
                 server_logger.error("Failed to import Dynamic Control")
+                return
+            self._dc_interface = _dynamic_control.acquire_dynamic_control_interface()
 
     def _refresh_handles(self):
         """
         刷新刚体句柄缓存。
         在场景加载、重置或首次运行时调用，避免每帧查找路径。
         """
+        self._last_vel_time = None
         self._initialize_dc_interface()
         if not self._dc_interface:
             return
 
-        from omni.isaac.dynamic_control import _dynamic_control
-        INVALID = _dynamic_control.INVALID_HANDLE
+        INVALID = _INVALID_HANDLE
 
-        # 获取 Disk 句柄
-        self._disk_handle = self._dc_interface.get_rigid_body(config.EXP1_DISK_PATH)
-        if self._disk_handle == INVALID:
-            # 尝试备用路径（兼容性）
-            self._disk_handle = self._dc_interface.get_rigid_body("/World/disk")
-        
-        # 获取 Ring 句柄
-        self._ring_handle = self._dc_interface.get_rigid_body(config.EXP1_RING_PATH)
-        if self._ring_handle == INVALID:
-            self._ring_handle = self._dc_interface.get_rigid_body("/World/ring")
+        # 先通过 stage 确定实际存在的路径（配置路径或备用路径，兼容性），
+        # 每个刚体只调用一次 get_rigid_body
+        stage = omni.usd.get_context().get_stage()
+        disk_path = self._resolve_body_path(stage, config.EXP1_DISK_PATH, "/World/disk")
+        ring_path = self._resolve_body_path(stage, config.EXP1_RING_PATH, "/World/ring")
+
+        self._disk_handle = self._dc_interface.get_rigid_body(disk_path)
+        self._ring_handle = self._dc_interface.get_rigid_body(ring_path)
+
+        self._body_view = None
+        if self._disk_handle != INVALID and self._ring_handle != INVALID:
+            self._refresh_body_view(disk_path, ring_path)
 
         server_logger.info(f"Handles refreshed. Disk: {self._disk_handle}, Ring: {self._ring_handle}")
         self._dirty_handles = False
 
+    @staticmethod
+    def _resolve_body_path(stage, path: str, fallback: str) -> str:
+        """配置路径存在时返回配置路径，否则返回备用路径"""
+        if stage and not stage.GetPrimAtPath(path).IsValid() and stage.GetPrimAtPath(fallback).IsValid():
+            return fallback
+        return path
+
+    def _refresh_body_view(self, disk_path: str, ring_path: str):
+        """
+        为 disk/ring 创建 RigidPrimView，之后每帧一次调用即可读取两者的角速度。
+        Isaac Core 不可用或物理视图未就绪时保持 None，继续使用 DC 句柄。
+        """
+        try:
+            from omni.isaac.core.prims import RigidPrimView
+
+            view = RigidPrimView(
+                prim_paths_expr=[disk_path, ring_path],
+                name="exp1_rigid_bodies",
+                reset_xform_properties=False
+            )
+            view.initialize()
+            prim_paths = list(view.prim_paths)
+            self._disk_view_idx = prim_paths.index(disk_path)
+            self._ring_view_idx = prim_paths.index(ring_path)
+            self._body_view = view
+        except Exception as e:
+            server_logger.warn(f"RigidPrimView unavailable, using DC handles: {e}")
+            self._body_view = None
+
+    async def _await_next_update(self, frames: int = 1):
+        """
+        等待 Kit 应用推进指定帧数（替代固定时长的 sleep）
+        """
+        future = asyncio.get_event_loop().create_future()
+        remaining = [frames]
+
+        def _on_update(event):
+            remaining[0] -= 1
+            if remaining[0] <= 0 and not future.done():
+                future.set_result(None)
+
+        sub = omni.kit.app.get_app().get_update_event_stream().create_subscription_to_pop(_on_update)
+        try:
+            await future
+        finally:
+            sub = None
+
+    def _get_mass_attr(self, prim_path: str, prim):
+        """获取（并缓存）prim 的质量属性，首次调用时 Apply MassAPI"""
+        mass_attr = self._mass_attrs.get(prim_path)
+        if not mass_attr:
+            mass_attr = UsdPhysics.MassAPI.Apply(prim).GetMassAttr()
+            self._mass_attrs[prim_path] = mass_attr
+        return mass_attr
+
     async def _update_mass_safe(self, prim_path: str, mass: float) -> bool:
         """
         [关键修复] 安全地更新质量
@@ -80,7 +183,7 @@ class ExperimentManager:
             if not stage: return False
 
             prim = stage.GetPrimAtPath(prim_path)
-            if not prim or not prim.IsValid():
+            if not prim:
                 server_logger.warn(f"Prim not found: {prim_path}")
                 return False
 
@@ -90,17 +193,13 @@ class ExperimentManager:
             if was_playing:
                 tl.pause()
                 # 等待一帧以确保状态切换
-                await asyncio.sleep(0.05)
+                await self._await_next_update(1)
 
             # 修改 USD 属性
-            mass_api = UsdPhysics.MassAPI.Apply(prim)
-            mass_api.GetMassAttr().Set(mass)
-
-            # 强制刷新句柄（物理属性改变可能导致内部重置）
-            self._dirty_handles = True
+            self._get_mass_attr(prim_path, prim).Set(mass)
 
             if was_playing:
-                await asyncio.sleep(0.05)
+                await self._await_next_update(1)
                 tl.play()
             
             return True
@@ -120,7 +219,47 @@ class ExperimentManager:
         server_logger.info(f"Setting Ring Mass -> {value}")
         return await self._update_mass_safe(config.EXP1_RING_PATH, value)
 
-    async def set_exp1_initial_velocity(self, value: float) -> bool:
+    async def set_exp1_masses(self, disk_mass: float, ring_mass: float) -> bool:
+        """
+        同时设置圆盘和圆环质量
+        两次写入共用一次暂停/恢复，并放在同一个 ChangeBlock 中
+        """
+        self.exp1_disk_mass = disk_mass
+        self.exp1_ring_mass = ring_mass
+        server_logger.info(f"Setting Disk Mass -> {disk_mass}, Ring Mass -> {ring_mass}")
+
+        try:
+            stage = omni.usd.get_context().get_stage()
+            if not stage: return False
+
+            disk_prim = stage.GetPrimAtPath(config.EXP1_DISK_PATH)
+            ring_prim = stage.GetPrimAtPath(config.EXP1_RING_PATH)
+            for path, prim in ((config.EXP1_DISK_PATH, disk_prim), (config.EXP1_RING_PATH, ring_prim)):
+                if not prim:
+                    server_logger.warn(f"Prim not found: {path}")
+                    return False
+
+            tl = omni.timeline.get_timeline_interface()
+            was_playing = tl.is_playing()
+
+            if was_playing:
+                tl.pause()
+                await self._await_next_update(1)
+
+            with Sdf.ChangeBlock():
+                self._get_mass_attr(config.EXP1_DISK_PATH, disk_prim).Set(disk_mass)
+                self._get_mass_attr(config.EXP1_RING_PATH, ring_prim).Set(ring_mass)
+
+            if was_playing:
+                await self._await_next_update(1)
+                tl.play()
+
+            return True
+        except Exception as e:
+            server_logger.error(f"Failed to update masses: {e}")
+            return False
+
+    def set_exp1_initial_velocity(self, value: float) -> bool:
         """设置初始角速度"""
         self.exp1_initial_vel = value
         
@@ -129,8 +268,7 @@ class ExperimentManager:
         self._initialize_dc_interface()
         if self._dirty_handles: self._refresh_handles()
 
-        from omni.isaac.dynamic_control import _dynamic_control
-        if self._dc_interface and self._disk_handle != _dynamic_control.INVALID_HANDLE:
+        if self._dc_interface and self._disk_handle != _INVALID_HANDLE:
             # Z轴角速度
             self._dc_interface.set_rigid_body_angular_velocity(self._disk_handle, [0.0, 0.0, value])
             # 唤醒刚体
@@ -146,11 +284,30 @@ class ExperimentManager:
         if self._dirty_handles:
             self._refresh_handles()
 
+        # 物理状态只在 timeline 前进时变化，同一时刻的重复调用直接返回上次结果
+        t = self._timeline.get_current_time()
+        if t == self._last_vel_time:
+            return self._last_vel
+
+        self._last_vel = self._read_angular_velocities()
+        self._last_vel_time = t
+        return self._last_vel
+
+    def _read_angular_velocities(self) -> Tuple[float, float]:
+        """从 RigidPrimView 或 DC 句柄读取 (ring, disk) 的 Z 轴角速度"""
         if not self._dc_interface:
             return 0.0, 0.0
 
-        from omni.isaac.dynamic_control import _dynamic_control
-        INVALID = _dynamic_control.INVALID_HANDLE
+        # 优先用 RigidPrimView 一次读取全部刚体的角速度
+        if self._body_view is not None:
+            try:
+                w = self._body_view.get_angular_velocities()
+                return float(w[self._ring_view_idx, 2]), float(w[self._disk_view_idx, 2])
+            except Exception as e:
+                server_logger.warn(f"RigidPrimView read failed, falling back to DC: {e}")
+                self._body_view = None
+
+        INVALID = _INVALID_HANDLE
         
         d_vel = 0.0
         r_vel = 0.0
@@ -167,6 +324,16 @@ class ExperimentManager:
 
         return r_vel, d_vel
 
+    def get_angular_velocities_np(self) -> np.ndarray:
+        """
+        以 ndarray 形式获取角速度 [ring, disk]
+        返回的是内部预分配缓冲区，下次调用时会被覆盖，需要保存时请 copy()
+        """
+        r_vel, d_vel = self.get_angular_velocities()
+        self._w_buf[0] = r_vel
+        self._w_buf[1] = d_vel
+        return self._w_buf
+
     async def reset_all_rigid_bodies_velocity(self):
         """重置所有速度并清理句柄缓存"""
         self._dirty_handles = True # 标记句柄需要刷新
@@ -182,5 +349,7 @@ class ExperimentManager:
         self.current_experiment_id = experiment_id
         # 强制刷新句柄，因为可能加载了新 USD
         self._dirty_handles = True 
+        if self.camera_controller:
+            self.camera_controller.invalidate_camera_cache()
         server_logger.info(f"Entered Experiment {experiment_id}")
         # 这里可以加入加载 Camera 配置的逻辑
\ No newline at end of file
@@ -5,7 +5,9 @@ import omni.timeline
 
 from config import (
     SIMULATION_CHECK_INTERVAL,
-    TELEMETRY_BROADCAST_INTERVAL
+    TELEMETRY_BROADCAST_INTERVAL,
+    TELEMETRY_MAX_BATCH,
+    TELEMETRY_MAX_DELAY
 )
 from utils.logging_helper import simulation_logger
 
@@ -15,20 +17,58 @@ class SimulationMonitor:
     负责以高频率（如 20Hz）广播物理数据
     """
 
+    __slots__ = (
+        "experiment_manager", "broadcast_callback", "_monitor_task", "_is_running",
+        "_timeline", "_wake_event", "_play_sub",
+        "_sample_pool", "_batch_msg", "_batch_len", "_batch_start_time", "_batch_experiment",
+    )
+
     def __init__(self, experiment_manager=None, broadcast_callback: Optional[Callable] = None):
         self.experiment_manager = experiment_manager
         self.broadcast_callback = broadcast_callback
         self._monitor_task = None
         self._is_running = False
+        # timeline 接口是单例，在 start() 中获取一次
+        self._timeline = None
+
+        # 仿真未播放时循环以 SIMULATION_CHECK_INTERVAL 低频轮询，
+        # timeline 开始播放时通过 _wake_event 立即唤醒
+        self._wake_event = asyncio.Event()
+        self._play_sub = None
+
+        # 预分配的遥测样本池，每批复用同一组字典，原地写入数值
+        # 广播回调必须在返回前消费（序列化）消息，之后这些字典会被覆盖
+        self._sample_pool = [
+            {
+                "timestamp": 0.0,
+                "disk_angular_velocity": 0.0,
+                "ring_angular_velocity": 0.0,
+                "disk_mass": 0.0,
+                "ring_mass": 0.0
+            }
+            for _ in range(TELEMETRY_MAX_BATCH)
+        ]
+        self._batch_msg = {"type": "telemetry_batch", "data": None}
+
+        # 当前批次的样本数、第一个样本的采集时间及所属实验
+        # （切换实验时先发送旧批次，避免一条消息混合两个实验的样本）
+        self._batch_len = 0
+        self._batch_start_time = 0.0
+        self._batch_experiment = None
 
     async def start(self):
         if self._is_running: return
         self._is_running = True
+        self._timeline = omni.timeline.get_timeline_interface()
+        self._play_sub = self._timeline.get_timeline_event_stream().create_subscription_to_pop_by_type(
+            int(omni.timeline.TimelineEventType.PLAY), lambda e: self._wake_event.set()
+        )
         self._monitor_task = asyncio.create_task(self._monitor_loop())
         simulation_logger.info(f"Telemetry Monitor started at {1.0/TELEMETRY_BROADCAST_INTERVAL:.1f} Hz")
 
     async def stop(self):
         self._is_running = False
+        self._play_sub = None
         if self._monitor_task:
             self._monitor_task.cancel()
             try:
@@ -37,41 +77,81 @@ class SimulationMonitor:
                 pass
             self._monitor_task = None
 
+    async def _flush_telemetry(self):
+        """将累积的遥测样本合并为一条消息发送"""
+        msg = self._batch_msg
+        msg["data"] = self._sample_pool[:self._batch_len]
+        self._batch_len = 0
+
+        if self.broadcast_callback:
+            await self.broadcast_callback(msg)
+
     async def _monitor_loop(self):
         """主监控循环"""
-        tl = omni.timeline.get_timeline_interface()
-        
+        tl = self._timeline
+        # 预先绑定循环中使用的 timeline 方法
+        tl_is_playing = tl.is_playing
+        tl_get_current_time = tl.get_current_time
+
+        # 使用单调时钟的截止时间调度，不受系统时间调整影响
+        next_sample = time.monotonic()
+        is_playing = False
+
         while self._is_running:
-            start_time = time.time()
+            now = time.monotonic()
             
             try:
-                is_playing = tl.is_playing()
-
-                # 只有在播放时才发送高频遥测数据
-                if is_playing and self.experiment_manager:
-                    # 使用优化后的方法获取速度
-                    r_vel, d_vel = self.experiment_manager.get_angular_velocities()
-                    
-                    # 构建数据包
-                    msg = {
-                        "type": "telemetry",
-                        "data": {
-                            "timestamp": tl.get_current_time(), # 仿真时间
-                            "disk_angular_velocity": d_vel,
-                            "ring_angular_velocity": r_vel,
-                            # 可以根据质量计算角动量 L = I * w
-                            "disk_mass": self.experiment_manager.exp1_disk_mass,
-                            "ring_mass": self.experiment_manager.exp1_ring_mass
-                        }
-                    }
-                    
-                    if self.broadcast_callback:
-                        await self.broadcast_callback(msg)
+                is_playing = tl_is_playing()
+
+                if now >= next_sample:
+                    # 按固定相位推进采样时刻；落后超过一个周期时跳过错过的采样
+                    next_sample += TELEMETRY_BROADCAST_INTERVAL
+                    if next_sample < now:
+                        next_sample = now + TELEMETRY_BROADCAST_INTERVAL
+
+                    # 只有在播放时才采集高频遥测数据
+                    if is_playing and self.experiment_manager:
+                        # 使用优化后的方法获取速度
+                        r_vel, d_vel = self.experiment_manager.get_angular_velocities()
+                        
+                        experiment_id = self.experiment_manager.current_experiment_id
+                        if self._batch_len and experiment_id != self._batch_experiment:
+                            await self._flush_telemetry()
+                        if not self._batch_len:
+                            self._batch_start_time = now
+                            self._batch_experiment = experiment_id
+                        sample = self._sample_pool[self._batch_len]
+                        self._batch_len += 1
+                        sample["timestamp"] = tl_get_current_time() # 仿真时间
+                        sample["disk_angular_velocity"] = d_vel
+                        sample["ring_angular_velocity"] = r_vel
+                        # 可以根据质量计算角动量 L = I * w
+                        sample["disk_mass"] = self.experiment_manager.exp1_disk_mass
+                        sample["ring_mass"] = self.experiment_manager.exp1_ring_mass
+
+                # 样本数或等待时间达到上限时合并发送；停止播放后立即发送剩余样本
+                if self._batch_len and (
+                    not is_playing
+                    or self._batch_len >= TELEMETRY_MAX_BATCH
+                    or now - self._batch_start_time >= TELEMETRY_MAX_DELAY
+                ):
+                    await self._flush_telemetry()
 
             except Exception as e:
                 simulation_logger.error(f"Monitor Loop Error: {e}", suppress=True)
 
-            # 精确控制频率
-            elapsed = time.time() - start_time
-            sleep_time = max(0, TELEMETRY_BROADCAST_INTERVAL - elapsed)
-            await asyncio.sleep(sleep_time)
\ No newline at end of file
+            # 空闲（未播放且无待发送样本）时低频轮询，开始播放时由事件唤醒
+            if not is_playing and not self._batch_len:
+                self._wake_event.clear()
+                try:
+                    await asyncio.wait_for(self._wake_event.wait(), SIMULATION_CHECK_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                next_sample = time.monotonic()
+                continue
+
+            # 休眠到下一个到期事件：下一次采样，或当前批次的发送截止时间
+            deadline = next_sample
+            if self._batch_len:
+                deadline = min(deadline, self._batch_start_time + TELEMETRY_MAX_DELAY)
+            await asyncio.sleep(max(0.0, deadline - time.monotonic()))
\ No newline at end of file
@@ -26,6 +26,12 @@ try:
 except ImportError:
     HAS_REPLICATOR = False
 
+try:
+    import cv2
+    HAS_CV2 = True
+except ImportError:
+    HAS_CV2 = False
+
 from config import (
     VIDEO_WIDTH,
     VIDEO_HEIGHT,
@@ -34,6 +40,7 @@ from config import (
 )
 from utils.logging_helper import video_logger
 from utils.frame_validator import FrameValidator
+from utils.frame_kernels import HAS_NUMBA, float_to_u8_rgb
 from utils.async_helper import safe_set_event
 
 
@@ -51,8 +58,11 @@ class CaptureDelegate:
             video_track: Reference to the IsaacSimVideoTrack instance
         """
         self.video_track = video_track
-        self._capture_error_logged = False
-        self._texture_read_error_logged = False
+
+        # Two reusable RGB destination buffers, filled alternately so the frame
+        # handed to the video track is not overwritten by the next capture
+        self._rgb_buffers = [None, None]
+        self._buffer_index = 0
 
     def capture(self, all_aovs, frame_info, texture, result_handle):
         """
@@ -127,14 +137,10 @@ class CaptureDelegate:
                                 return
 
                 except Exception as e:
-                    if not self._texture_read_error_logged:
-                        video_logger.warn(f"Texture read method failed: {e}")
-                        self._texture_read_error_logged = True
+                    video_logger.log_once("texture_read_error", f"Texture read method failed: {e}")
 
         except Exception as e:
-            if not self._capture_error_logged:
-                video_logger.error(f"Capture delegate error: {e}", exc_info=True)
-                self._capture_error_logged = True
+            video_logger.log_once("capture_error", f"Capture delegate error: {e}", level="error", exc_info=True)
 
     def _read_rp_resource(self, resource, width: int, height: int) -> Optional[np.ndarray]:
         """
@@ -156,16 +162,39 @@ class CaptureDelegate:
                     img_array = np.frombuffer(data, dtype=np.uint8)
                     # Reshape to image (RGBA format typically)
                     if len(img_array) == width * height * 4:
-                        img = img_array.reshape((height, width, 4))
-                        return img[:, :, :3].copy()  # RGB only
+                        img = img_array.reshape((height, width, 4))[:, :, :3]  # RGB only
                     elif len(img_array) == width * height * 3:
                         img = img_array.reshape((height, width, 3))
-                        return img.copy()
+                    else:
+                        return None
+
+                    # Copy out of the renderer's buffer into a preallocated frame
+                    dst = self._next_buffer(height, width)
+                    np.copyto(dst, img)
+                    return dst
         except Exception as e:
             video_logger.warn(f"RpResource read failed: {e}", suppress=True)
 
         return None
 
+    def _next_buffer(self, height: int, width: int) -> np.ndarray:
+        """
+        Get the next RGB destination buffer, reallocating it if the size changed
+
+        Args:
+            height: Image height
+            width: Image width
+
+        Returns:
+            Contiguous (height, width, 3) uint8 array
+        """
+        self._buffer_index ^= 1
+        buffer = self._rgb_buffers[self._buffer_index]
+        if buffer is None or buffer.shape[0] != height or buffer.shape[1] != width:
+            buffer = np.empty((height, width, 3), dtype=np.uint8)
+            self._rgb_buffers[self._buffer_index] = buffer
+        return buffer
+
 
 class IsaacSimVideoTrack(VideoStreamTrack):
     """
@@ -194,13 +223,26 @@ class IsaacSimVideoTrack(VideoStreamTrack):
         self.height = height - (height % 2)
         self.fps = fps
         self.frame_interval = 1.0 / fps
-        self.last_frame_time = 0
+        self.time_base = fractions.Fraction(1, fps)
+        self._next_frame_deadline = 0.0  # Monotonic time the next frame is due
         self.frame_count = 0
 
         # Frame storage
         self.latest_frame = None
         self.capture_event = asyncio.Event()
 
+        # Double buffer filled by the background capture task: Replicator frames are
+        # written straight into _capture_buffers[_back_index], and the validated frame
+        # is published to recv() by swapping the _ready_frame reference
+        self._capture_buffers = [
+            np.empty((self.height, self.width, 3), dtype=np.uint8),
+            np.empty((self.height, self.width, 3), dtype=np.uint8),
+        ]
+        self._back_index = 0
+        self._ready_frame = None
+        self._new_frame_event = asyncio.Event()
+        self._capture_task = None
+
         # Create capture delegate (fallback method)
         self.capture_delegate = CaptureDelegate(self)
 
@@ -211,13 +253,27 @@ class IsaacSimVideoTrack(VideoStreamTrack):
         self.use_replicator = HAS_REPLICATOR
         self.render_product = None
         self.rgb_annotator = None
+        # Bound Replicator calls, resolved once when the annotator is attached
+        self._step_async = None
+        self._get_data = None
+        # Reused uint8 RGB staging for Replicator data that needs resizing
+        self._rgb_frame_buffer = None
+        # Float scratch for the NumPy conversion fallback (unused when numba is available)
+        self._float_scratch = None
+        # Reused destination for cv2.resize
+        self._resize_buffer = None
 
         # Error tracking
         self._frame_error_count = 0
         self._max_error_log = 5
-        self._capture_success_logged = False
-        self._replicator_error_logged = False
         self._timeout_warning_count = 0
+        self._first_frame_logged = False
+
+        # With the Fabric Scene Delegate enabled, the Replicator annotator returns empty
+        # data; detect it once here and go straight to schedule_capture
+        if self.use_replicator and carb.settings.get_settings().get("/app/useFabricSceneDelegate"):
+            video_logger.warn("Fabric Scene Delegate enabled; skipping Replicator capture", suppress=False)
+            self.use_replicator = False
 
         if self.use_replicator:
             try:
@@ -234,6 +290,8 @@ class IsaacSimVideoTrack(VideoStreamTrack):
                 # Create RGB annotator
                 self.rgb_annotator = rep.AnnotatorRegistry.get_annotator("rgb")
                 self.rgb_annotator.attach([self.render_product])
+                self._step_async = rep.orchestrator.step_async
+                self._get_data = self.rgb_annotator.get_data
 
                 video_logger.info(
                     f"Video track initialized with Replicator: "
@@ -256,31 +314,50 @@ class IsaacSimVideoTrack(VideoStreamTrack):
         Receive next frame - aiortc automatically calls this method
         Returns properly validated VideoFrame
         """
-        # Control frame rate
-        current_time = time.time()
-        elapsed = current_time - self.last_frame_time
-
-        if elapsed < self.frame_interval:
-            await asyncio.sleep(self.frame_interval - elapsed)
+        # Control frame rate against absolute monotonic deadlines (no drift);
+        # after falling more than two frames behind, restart the schedule
+        now = time.monotonic()
+        delay = self._next_frame_deadline - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if -delay > 2 * self.frame_interval:
+            self._next_frame_deadline = now + self.frame_interval
+        else:
+            self._next_frame_deadline += self.frame_interval
 
-        self.last_frame_time = time.time()
         self.frame_count += 1
 
-        # Capture frame from Isaac Sim (async)
-        frame_array = await self._capture_isaac_frame_async()
+        # Frames are captured by a background task; start it on first use
+        if self._capture_task is None or self._capture_task.done():
+            self._capture_task = asyncio.ensure_future(self._capture_loop())
+
+        # Wait briefly for a fresh frame, otherwise repeat the newest one
+        if not self._new_frame_event.is_set():
+            has_frame = self._ready_frame is not None
+            try:
+                await asyncio.wait_for(
+                    self._new_frame_event.wait(),
+                    timeout=self.frame_interval if has_frame else FRAME_CAPTURE_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                pass
+        self._new_frame_event.clear()
 
-        if frame_array is None:
-            frame_array = self.frame_validator.generate_test_pattern()
+        # Published frames were already validated by the capture task
+        frame_array = self._ready_frame
 
-        # Validate and fix frame data using FrameValidator
         try:
-            frame_array = self.frame_validator.validate_and_fix(frame_array)
-
             if frame_array is None:
-                raise ValueError("Frame validation failed")
+                # Validate and fix the test pattern fallback using FrameValidator
+                frame_array = self.frame_validator.validate_and_fix(
+                    self.frame_validator.generate_test_pattern()
+                )
+
+                if frame_array is None:
+                    raise ValueError("Frame validation failed")
 
             # Debug: Log first frame details
-            if not hasattr(self, '_first_frame_logged'):
+            if not self._first_frame_logged:
                 video_logger.info(
                     f"First frame details: "
                     f"shape={frame_array.shape}, "
@@ -294,7 +371,7 @@ class IsaacSimVideoTrack(VideoStreamTrack):
             # Convert to VideoFrame
             frame = VideoFrame.from_ndarray(frame_array, format="rgb24")
             frame.pts = self.frame_count
-            frame.time_base = fractions.Fraction(1, self.fps)
+            frame.time_base = self.time_base
 
             return frame
 
@@ -311,9 +388,38 @@ class IsaacSimVideoTrack(VideoStreamTrack):
             test_frame = self.frame_validator.generate_blank_frame()
             frame = VideoFrame.from_ndarray(test_frame, format="rgb24")
             frame.pts = self.frame_count
-            frame.time_base = fractions.Fraction(1, self.fps)
+            frame.time_base = self.time_base
             return frame
 
+    async def _capture_loop(self):
+        """
+        Background capture task - captures frames at the target frame rate into
+        the back buffer and publishes them by swapping the _ready_frame reference
+        """
+        next_capture = time.monotonic()
+        while True:
+            try:
+                frame_array = await self._capture_isaac_frame_async()
+                if frame_array is not None:
+                    frame_array = self.frame_validator.validate_and_fix(frame_array)
+
+                if frame_array is not None:
+                    # The published frame is never the next capture target
+                    self._ready_frame = frame_array
+                    self._back_index ^= 1
+                    self._new_frame_event.set()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                video_logger.error(f"Capture loop error: {e}", suppress=True)
+
+            # Keep a fixed capture cadence; skip missed slots instead of bursting
+            next_capture += self.frame_interval
+            now = time.monotonic()
+            if next_capture < now:
+                next_capture = now
+            await asyncio.sleep(next_capture - now)
+
     async def _capture_isaac_frame_async(self) -> Optional[np.ndarray]:
         """
         Capture frame from Isaac Sim viewport - uses Replicator API
@@ -326,10 +432,10 @@ class IsaacSimVideoTrack(VideoStreamTrack):
                 # Use Replicator method (recommended)
                 try:
                     # Wait for one frame to render
-                    await rep.orchestrator.step_async()
+                    await self._step_async()
 
                     # Get RGB data
-                    data = self.rgb_annotator.get_data()
+                    data = self._get_data()
 
                     if data is not None and isinstance(data, np.ndarray):
                         # Validate data
@@ -337,50 +443,55 @@ class IsaacSimVideoTrack(VideoStreamTrack):
                             video_logger.warn("Replicator returned empty data", suppress=True)
                             return None
 
-                        # Convert RGBA to RGB if needed
-                        if len(data.shape) == 3 and data.shape[2] == 4:
-                            rgb_data = data[:, :, :3]
-                        elif len(data.shape) == 3 and data.shape[2] == 3:
-                            rgb_data = data
-                        else:
+                        if len(data.shape) != 3 or data.shape[2] not in (3, 4):
                             video_logger.warn(
                                 f"Unexpected data shape: {data.shape}",
                                 suppress=True
                             )
                             return None
 
+                        # Write straight into the back buffer when the render product
+                        # matches the track size, otherwise stage the frame for resizing
+                        if data.shape[0] == self.height and data.shape[1] == self.width:
+                            frame = self._capture_buffers[self._back_index]
+                        else:
+                            frame = self._rgb_frame_buffer
+                            if frame is None or frame.shape[:2] != data.shape[:2]:
+                                frame = np.empty((data.shape[0], data.shape[1], 3), dtype=np.uint8)
+                                self._rgb_frame_buffer = frame
+
                         # Handle different data types
-                        if rgb_data.dtype in (np.float32, np.float64):
-                            # Check for NaN and Inf
-                            if np.isnan(rgb_data).any() or np.isinf(rgb_data).any():
+                        if data.dtype in (np.float32, np.float64):
+                            # Replicator returns float32 [0, 1] range: drop alpha, replace
+                            # NaN/Inf and scale to [0, 255] uint8 in a single pass
+                            scratch = None
+                            if not HAS_NUMBA:
+                                scratch = self._float_scratch
+                                if scratch is None or scratch.shape != frame.shape:
+                                    scratch = np.empty(frame.shape, dtype=np.float32)
+                                    self._float_scratch = scratch
+                            if float_to_u8_rgb(data, frame, scratch):
                                 video_logger.warn(
                                     "Replicator data contains NaN/Inf",
                                     suppress=True
                                 )
-                                rgb_data = np.nan_to_num(
-                                    rgb_data,
-                                    nan=0.0,
-                                    posinf=1.0,
-                                    neginf=0.0
-                                )
-
-                            # Replicator returns float32 [0, 1] range, scale to [0, 255]
-                            frame = (rgb_data * 255).clip(0, 255).astype(np.uint8)
                         else:
-                            # If already integer type, convert directly
-                            frame = rgb_data.astype(np.uint8)
+                            # Convert RGBA to RGB if needed; integer types convert directly
+                            np.copyto(frame, data[:, :, :3], casting="unsafe")
 
                         # Log success (only once)
-                        if not self._capture_success_logged:
-                            video_logger.info("Replicator capture working!")
-                            self._capture_success_logged = True
+                        video_logger.log_once("replicator_capture_ok", "Replicator capture working!", level="info")
 
-                        return self._resize_frame(frame)
+                        # The render product is created at the track size and the frame is
+                        # already uint8, so the generic resize/convert step is normally skipped
+                        if frame.shape[0] != self.height or frame.shape[1] != self.width:
+                            frame = self._resize_frame(frame)
+                        return frame
 
                 except Exception as e:
-                    if not self._replicator_error_logged:
-                        video_logger.error(f"Replicator capture error: {e}", exc_info=True)
-                        self._replicator_error_logged = True
+                    video_logger.log_once(
+                        "replicator_capture_error", f"Replicator capture error: {e}", level="error", exc_info=True
+                    )
                     # Fallback to old method
                     self.use_replicator = False
 
@@ -434,9 +545,19 @@ class IsaacSimVideoTrack(VideoStreamTrack):
             else:
                 frame = frame.astype(np.uint8)
 
-        # Check if resize is needed
+        # Check if resize is needed (Replicator render products already match)
         if frame.shape[0] != self.height or frame.shape[1] != self.width:
             try:
+                if HAS_CV2:
+                    if self._resize_buffer is None:
+                        self._resize_buffer = np.empty((self.height, self.width, 3), dtype=np.uint8)
+                    return cv2.resize(
+                        frame,
+                        (self.width, self.height),
+                        dst=self._resize_buffer,
+                        interpolation=cv2.INTER_LINEAR
+                    )
+
                 from PIL import Image
                 img = Image.fromarray(frame)
                 img = img.resize((self.width, self.height), Image.BILINEAR)
@@ -450,6 +571,9 @@ class IsaacSimVideoTrack(VideoStreamTrack):
     def stop(self):
         """Stop the video track and cleanup resources"""
         try:
+            if self._capture_task is not None:
+                self._capture_task.cancel()
+                self._capture_task = None
             if self.rgb_annotator:
                 self.rgb_annotator.detach()
             if self.render_product:
@@ -57,6 +57,9 @@ class IsaacService {
             // 处理不同类型的消息
             if (payload.type === 'telemetry') {
               this.notifySubscribers(payload.data);
+            } else if (payload.type === 'telemetry_batch') {
+              // 服务器将多个遥测样本合并为一条消息发送
+              payload.data.forEach((sample: TelemetryData) => this.notifySubscribers(sample));
             } else if (payload.type === 'scene_info' || payload.type === 'scene_status') {
               this.notifySceneInfoSubscribers(payload.data);
             } else if (payload.type === 'connected') {
@@ -15,6 +15,7 @@ from pxr import PhysxSchema
 import asyncio
 import json
 import math
+import random
 import time
 import numpy as np
 from typing import Optional, Dict, Any, Set
@@ -85,9 +86,13 @@ else:
         EXP1_DEFAULT_INITIAL_VELOCITY = 0.0
         SIMULATION_CHECK_INTERVAL = 0.1
         TELEMETRY_BROADCAST_INTERVAL = 0.05
+        TELEMETRY_MAX_BATCH = 20
+        TELEMETRY_MAX_DELAY = 0.05
         HOST_IP = "127.0.0.1"
     config = ConfigMock()
 
+from camera.presets import apply_camera_preset, clear_camera_cache
+
 # WebRTC依赖
 try:
     from aiohttp import web
@@ -106,9 +111,47 @@ except ImportError:
     HAS_REPLICATOR = False
     carb.log_warn("❌ Replicator not available")
 
+# OpenCV 依赖（可选，SIMD 加速的帧缩放，不可用时回退到 PIL）
+try:
+    import cv2
+    HAS_CV2 = True
+except ImportError:
+    HAS_CV2 = False
+
+# orjson 依赖（可选，加速遥测 JSON 序列化）
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+def dumps_json(obj) -> str:
+    """序列化为 JSON 字符串，优先使用 orjson"""
+    if HAS_ORJSON:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+# Dynamic Control 依赖（读取刚体角速度）
+try:
+    from omni.isaac.dynamic_control import _dynamic_control
+    _DC_INVALID_HANDLE = _dynamic_control.INVALID_HANDLE
+except ImportError:
+    _dynamic_control = None
+    _DC_INVALID_HANDLE = -1
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("webrtc")
 
+# 已记录过的一次性日志 key
+_logged_once = set()
+
+def log_warn_once(key, message):
+    """同一 key 只输出一次 warn 日志"""
+    if key in _logged_once:
+        return
+    _logged_once.add(key)
+    carb.log_warn(message)
+
 # ============================================================
 # 辅助函数：获取本机局域网 IP
 # ============================================================
@@ -126,6 +169,10 @@ def get_host_ip():
 # ============================================================
 # 2. 视频轨道类 (Video Track)
 # ============================================================
+# Replicator 初始化失败后的重试退避：基础间隔（秒）× 2^已失败次数 + 随机抖动
+_INIT_RETRY_BASE_DELAY = 0.5
+_INIT_RETRY_JITTER = 0.1
+
 class IsaacSimVideoTrack(VideoStreamTrack):
     def __init__(self, width: int = config.VIDEO_WIDTH, height: int = config.VIDEO_HEIGHT, fps: int = config.VIDEO_FPS):
         super().__init__()
@@ -133,7 +180,8 @@ class IsaacSimVideoTrack(VideoStreamTrack):
         self.height = height - (height % 2)
         self.fps = fps
         self.frame_interval = 1.0 / fps
-        self.last_frame_time = 0
+        self.time_base = fractions.Fraction(1, fps)
+        self._next_frame_deadline = 0.0  # 下一帧的截止时间（单调时钟）
         self.frame_count = 0
         self.warmup_frames = 30  # 增加预热帧数，等待场景稳定
         self.use_replicator = HAS_REPLICATOR
@@ -142,6 +190,16 @@ class IsaacSimVideoTrack(VideoStreamTrack):
         self._replicator_initialized = False
         self._init_retry_count = 0
         self._max_init_retries = 5
+        self._next_init_time = 0.0  # 下一次允许尝试初始化的时间（单调时钟）
+        self._resize_dst = None  # cv2.resize 复用的输出缓冲区
+        # 测试图案内容固定，只生成一次；设为只读，防止下游原地修改
+        self._test_pattern = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+        self._test_pattern[:, :, 1] = 128
+        self._test_pattern.flags.writeable = False
+        self._empty_count = 0  # get_data() 连续返回空数据的次数
+        # 缓存的 viewport Camera 对象及其相机路径
+        self._cached_camera = None
+        self._cached_camera_path = None
         # 不在构造函数中初始化 replicator，等待场景稳定后再初始化
 
     async def _init_replicator_async(self):
@@ -218,12 +276,16 @@ class IsaacSimVideoTrack(VideoStreamTrack):
             self.frame_count += 1
             await asyncio.sleep(0.1)
             return VideoFrame.from_ndarray(self._generate_test_pattern(), format="rgb24")
-        current_time = time.time()
-        elapsed = current_time - self.last_frame_time
-        if elapsed < self.frame_interval:
-            await asyncio.sleep(self.frame_interval - elapsed)
-        
-        self.last_frame_time = time.time()
+        # 按单调时钟的绝对截止时间控制帧率，避免累积漂移；落后超过两帧时重新对齐
+        now = time.monotonic()
+        delay = self._next_frame_deadline - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if -delay > 2 * self.frame_interval:
+            self._next_frame_deadline = now + self.frame_interval
+        else:
+            self._next_frame_deadline += self.frame_interval
+
         self.frame_count += 1
 
         frame_array = await self._capture_isaac_frame_async()
@@ -241,10 +303,19 @@ class IsaacSimVideoTrack(VideoStreamTrack):
             
             # 如果帧大小不对，调整大小
             if frame_array.shape[0] != self.height or frame_array.shape[1] != self.width:
-                from PIL import Image
-                img = Image.fromarray(frame_array[:, :, :3] if frame_array.shape[2] == 4 else frame_array)
-                img = img.resize((self.width, self.height), Image.LANCZOS)
-                frame_array = np.array(img)
+                src = frame_array[:, :, :3] if frame_array.shape[2] == 4 else frame_array
+                if HAS_CV2 and src.dtype == np.uint8:
+                    if self._resize_dst is None:
+                        self._resize_dst = np.empty((self.height, self.width, 3), dtype=np.uint8)
+                    frame_array = cv2.resize(
+                        np.ascontiguousarray(src), (self.width, self.height),
+                        dst=self._resize_dst, interpolation=cv2.INTER_LANCZOS4
+                    )
+                else:
+                    from PIL import Image
+                    img = Image.fromarray(src)
+                    img = img.resize((self.width, self.height), Image.LANCZOS)
+                    frame_array = np.array(img)
             
             if not (frame_array.dtype == np.uint8 and frame_array.flags['C_CONTIGUOUS']):
                 frame_array = self._validate_and_fix_frame(frame_array)
@@ -252,7 +323,7 @@ class IsaacSimVideoTrack(VideoStreamTrack):
         try:
             frame = VideoFrame.from_ndarray(frame_array, format="rgb24")
             frame.pts = self.frame_count
-            frame.time_base = fractions.Fraction(1, self.fps)
+            frame.time_base = self.time_base
             return frame
         except Exception:
             return VideoFrame.from_ndarray(self._generate_test_pattern(), format="rgb24")
@@ -266,9 +337,7 @@ class IsaacSimVideoTrack(VideoStreamTrack):
         return np.ascontiguousarray(frame_array)
 
     def _generate_test_pattern(self):
-        frame = np.zeros((self.height, self.width, 3), dtype=np.uint8)
-        frame[:, :, 1] = 128
-        return frame
+        return self._test_pattern
 
     async def _capture_isaac_frame_async(self):
         """优先使用 viewport 获取帧（不影响仿真）"""
@@ -300,7 +369,7 @@ class IsaacSimVideoTrack(VideoStreamTrack):
                 return None
             
             # 使用缓存的 Camera 对象
-            if not hasattr(self, '_cached_camera') or self._cached_camera_path != str(camera_path):
+            if self._cached_camera is None or self._cached_camera_path != str(camera_path):
                 try:
                     self._cached_camera = Camera(
                         prim_path=str(camera_path),
@@ -320,9 +389,7 @@ class IsaacSimVideoTrack(VideoStreamTrack):
                     rgb = rgba[:, :, :3]
                     return np.ascontiguousarray(rgb)
             except Exception as e:
-                if hasattr(self, '_cached_camera'):
-                    del self._cached_camera
-                pass
+                self._cached_camera = None
             
             return None
         except Exception as e:
@@ -335,10 +402,16 @@ class IsaacSimVideoTrack(VideoStreamTrack):
 
             # === 0. 检查并初始化 replicator ===
             if not self._replicator_initialized or self.rgb_annotator is None:
+                # 退避期间不重复初始化（每次初始化都要等待数十帧）
+                if time.monotonic() < self._next_init_time:
+                    return None
                 carb.log_warn(f"🔄 Need to initialize replicator (attempt {self._init_retry_count + 1}/{self._max_init_retries})...")
                 self._init_retry_count += 1
                 success = await self._init_replicator_async()
                 if not success:
+                    # 指数退避 + 抖动
+                    delay = _INIT_RETRY_BASE_DELAY * (2 ** (self._init_retry_count - 1))
+                    self._next_init_time = time.monotonic() + delay + random.uniform(0, _INIT_RETRY_JITTER)
                     if self._init_retry_count >= self._max_init_retries:
                         carb.log_warn("⚠️ Max init retries reached, resetting...")
                         self._init_retry_count = 0
@@ -364,8 +437,6 @@ class IsaacSimVideoTrack(VideoStreamTrack):
                 return None
             
             if data.size == 0:
-                if not hasattr(self, '_empty_count'):
-                    self._empty_count = 0
                 self._empty_count += 1
                 if self._empty_count > 30:
                     carb.log_warn("⚠️ get_data() returned empty too many times, reinitializing...")
@@ -398,6 +469,9 @@ class IsaacSimVideoTrack(VideoStreamTrack):
 # ============================================================
 # 3. 相机控制器
 # ============================================================
+# 角度转弧度系数
+_DEG2RAD = math.pi / 180.0
+
 class CameraController:
     def __init__(self):
         self.camera_distance = 10.0
@@ -429,8 +503,8 @@ class CameraController:
             camera_path = viewport.get_active_camera()
             if not camera_path: return
             
-            az_rad = math.radians(self.camera_azimuth)
-            el_rad = math.radians(self.camera_elevation)
+            az_rad = self.camera_azimuth * _DEG2RAD
+            el_rad = self.camera_elevation * _DEG2RAD
             x = self.camera_distance * math.cos(el_rad) * math.cos(az_rad)
             y = self.camera_distance * math.cos(el_rad) * math.sin(az_rad)
             z = self.camera_distance * math.sin(el_rad)
@@ -440,7 +514,7 @@ class CameraController:
             if not stage: return
             prim = stage.GetPrimAtPath(camera_path)
             
-            if prim and prim.IsValid():
+            if prim:
                 xform = UsdGeom.Xformable(prim)
                 xform.AddTranslateOp().Set(camera_pos)
         except: pass
@@ -457,6 +531,11 @@ class WebRTCServer:
         self.camera_controller = CameraController()
         self.video_track = None
         self.ws_clients = set()
+        # 每个客户端最新一条待发送的遥测消息（新批次覆盖旧批次）及其发送任务
+        self._telemetry_latest = {}
+        self._telemetry_senders = {}
+        # 已记录过遥测发送失败的客户端（每个连接只记录一次）
+        self._telemetry_send_failed = set()
 
         self.simulation_control_enabled = False
         self.auto_stop_enabled = True
@@ -484,10 +563,75 @@ class WebRTCServer:
         # 实验2周期计算变量（改进版 - 零交叉检测）
         self.exp2_zero_cross_times = []  # 记录零交叉时刻
         self.exp2_last_angle_sign = None  # 上一次角度的符号
+        self._last_angle_log_time = 0  # 实验2角度调试日志的上次输出时间
 
         self._dc_interface = None
         self.config_module = config
 
+        # 实验1 刚体句柄 (disk, ring) 与 prim 缓存，切换实验/加载场景/停止仿真时清空
+        self._exp1_rb_handles = None
+        self._exp1_prims = {}
+        self._exp1_mass_attrs = {}
+
+        # 最近一次角速度读数及其 timeline 时间（遥测频率高于物理步进时复用）
+        self._last_vel_time = None
+        self._last_vel = (0.0, 0.0)
+
+        # 进入实验的串行锁与进行中的请求（同一实验的重复请求等待已有结果）
+        self._enter_lock = asyncio.Lock()
+        self._enter_inflight = {}
+
+        # 实验编号 -> 参数应用函数（没有参数的实验不需要注册）
+        self._exp_param_handlers = {
+            "1": self._apply_exp1_params,
+            "2": self._apply_exp2_params,
+        }
+        self._timeline_sub = omni.timeline.get_timeline_interface().get_timeline_event_stream().create_subscription_to_pop_by_type(
+            int(omni.timeline.TimelineEventType.STOP), lambda e: self._invalidate_exp1_cache()
+        )
+
+    def _invalidate_exp1_cache(self):
+        """清空实验1的刚体句柄和 prim 缓存"""
+        self._exp1_rb_handles = None
+        self._exp1_prims.clear()
+        self._exp1_mass_attrs.clear()
+        self._last_vel_time = None
+
+    def _get_exp1_prim(self, stage, path):
+        """获取（并缓存）实验1的 prim，不存在时返回 None"""
+        prim = self._exp1_prims.get(path)
+        if prim:
+            return prim
+        prim = stage.GetPrimAtPath(path)
+        if not prim:
+            self._exp1_prims.pop(path, None)
+            return None
+        self._exp1_prims[path] = prim
+        return prim
+
+    def _get_exp1_mass_attr(self, stage, path):
+        """获取（并缓存）实验1 prim 的质量属性，prim 不存在时返回 None"""
+        mass_attr = self._exp1_mass_attrs.get(path)
+        if mass_attr:
+            return mass_attr
+        prim = self._get_exp1_prim(stage, path)
+        if not prim:
+            return None
+        if not prim.HasAPI(UsdPhysics.MassAPI):
+            UsdPhysics.MassAPI.Apply(prim)
+        mass_attr = UsdPhysics.MassAPI(prim).GetMassAttr()
+        self._exp1_mass_attrs[path] = mass_attr
+        return mass_attr
+
+    def _get_exp1_rb_handles(self, dc):
+        """获取 disk/ring 的 DC 刚体句柄，两者都有效时才缓存"""
+        if self._exp1_rb_handles is not None:
+            return self._exp1_rb_handles
+        handles = (dc.get_rigid_body("/World/exp1/disk"), dc.get_rigid_body("/World/exp1/ring"))
+        if _DC_INVALID_HANDLE not in handles:
+            self._exp1_rb_handles = handles
+        return handles
+
     async def _init_replicator_async(self, track):
         import omni.replicator.core as rep
         await asyncio.sleep(1.0)
@@ -580,11 +724,16 @@ class WebRTCServer:
     async def load_usd(self, request):
         params = await request.json()
         usd_path = params.get("usd_path", config.DEFAULT_USD_PATH)
-        success = omni.usd.get_context().open_stage(usd_path)
+        # 异步打开 stage，读取文件期间不阻塞事件循环（视频流和 WebSocket 继续工作）
+        success, error = await omni.usd.get_context().open_stage_async(usd_path)
+        if not success:
+            carb.log_error(f"💥 Failed to open stage {usd_path}: {error}")
         if success:
+            clear_camera_cache()
+            self._invalidate_exp1_cache()
             self.simulation_control_enabled = False
             omni.timeline.get_timeline_interface().stop()
-            await self._apply_exp1_params()
+            self._apply_exp1_params()
             return web.Response(text=json.dumps({"status": "ok"}))
         return web.Response(status=500, text="Failed")
 
@@ -625,7 +774,7 @@ class WebRTCServer:
                             carb.log_warn("▶️ Starting simulation (first run)...")
                             # 只有实验1需要设置初始角速度
                             if self.current_experiment == "1":
-                                await self._set_initial_angular_velocity()
+                                self._set_initial_angular_velocity()
                             self._has_started = True
                         else:
                             carb.log_warn("▶️ Resuming simulation...")
@@ -671,27 +820,7 @@ class WebRTCServer:
                     elif mtype == "enter_experiment":
                         # 进入实验 - 切换相机并重置物理状态
                         exp_id = data.get("experiment_id", "unknown")
-                        carb.log_warn(f"📍 Entering experiment: {exp_id}")
-
-                        # 更新当前实验编号
-                        self.current_experiment = exp_id
-
-                        # 清空实验2的历史数据和周期检测变量（切换实验时）
-                        self.exp2_angle_history = []
-                        self.exp2_last_peak_time = None
-                        self.exp2_period = 0.0
-                        self.exp2_period_samples = []
-                        self.exp2_zero_cross_times = []
-                        self.exp2_last_angle_sign = None
-
-                        # 切换到对应实验的相机
-                        await self._switch_camera(exp_id)
-
-                        # 根据实验编号应用对应的参数
-                        if exp_id == "1":
-                            await self._apply_exp1_params()
-                        elif exp_id == "2":
-                            await self._apply_exp2_params()
+                        await self._enter_experiment(exp_id)
 
                         # 发送确认消息
                         await ws.send_json({"type": "experiment_entered", "experiment_id": exp_id})
@@ -715,11 +844,11 @@ class WebRTCServer:
                     elif mtype == "set_disk_mass" or mtype == "set_mass":
                          self.exp1_disk_mass = float(data.get("value", 1.0))
                          carb.log_warn(f"📊 Set disk mass: {self.exp1_disk_mass} kg")
-                         await self._apply_exp1_params()
+                         self._apply_exp1_params()
                     elif mtype == "set_ring_mass":
                          self.exp1_ring_mass = float(data.get("value", 1.0))
                          carb.log_warn(f"📊 Set ring mass: {self.exp1_ring_mass} kg")
-                         await self._apply_exp1_params()
+                         self._apply_exp1_params()
                     elif mtype == "set_initial_velocity":
                          self.exp1_initial_vel = float(data.get("value", 5.0))
                          carb.log_warn(f"📊 Set initial velocity: {self.exp1_initial_vel} rad/s")
@@ -741,96 +870,76 @@ class WebRTCServer:
                         carb.log_warn(f"📨 Received unknown message type: {mtype}")
         finally:
             self.ws_clients.discard(ws)
+            self._telemetry_latest.pop(ws, None)
+            self._telemetry_senders.pop(ws, None)
+            self._telemetry_send_failed.discard(ws)
         return ws
 
-    def _switch_camera_sync(self, experiment_id: str):
-        """同步切换相机（在主线程中执行）"""
+    async def _enter_experiment(self, exp_id: str):
+        """进入实验：切换相机并应用实验参数
+
+        同一实验的并发请求（双击、多个客户端）合并为一次执行，
+        不同实验的请求通过锁串行执行
+        """
+        inflight = self._enter_inflight.get(exp_id)
+        if inflight is not None:
+            carb.log_warn(f"📍 Experiment {exp_id} is already being entered, waiting...")
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_event_loop().create_future()
+        self._enter_inflight[exp_id] = future
         try:
-            camera_script = os.path.join(_PROJECT_ROOT, 'camera', f'usd{experiment_id}.py')
-            carb.log_warn(f"📷 Looking for camera script: {camera_script}")
-            carb.log_warn(f"📷 PROJECT_ROOT: {_PROJECT_ROOT}")
-            
-            if os.path.exists(camera_script):
-                carb.log_warn(f"📷 Found script, reading content...")
-                
-                # 读取脚本内容
-                with open(camera_script, 'r', encoding='utf-8') as f:
-                    script_content = f.read()
-                
-                carb.log_warn(f"📷 Script content length: {len(script_content)} chars")
-                
-                # 直接执行相机设置逻辑，不使用 exec
+            async with self._enter_lock:
+                carb.log_warn(f"📍 Entering experiment: {exp_id}")
+
+                # 更新当前实验编号
+                self.current_experiment = exp_id
+                self._invalidate_exp1_cache()
+
+                # 清空实验2的历史数据和周期检测变量（切换实验时）
+                self.exp2_angle_history = []
+                self.exp2_last_peak_time = None
+                self.exp2_period = 0.0
+                self.exp2_period_samples = []
+                self.exp2_zero_cross_times = []
+                self.exp2_last_angle_sign = None
+
+                # 整个切换过程共用同一个 stage 引用
                 stage = omni.usd.get_context().get_stage()
-                if not stage:
-                    carb.log_error("💥 No USD stage available!")
-                    return
-                
-                # 获取活动相机
-                viewport = vp_util.get_active_viewport()
-                if viewport:
-                    camera_path = viewport.get_active_camera()
-                else:
-                    camera_path = "/OmniverseKit_Persp"
-                
-                carb.log_warn(f"📷 Using camera: {camera_path}")
-                
-                camera_prim = stage.GetPrimAtPath(camera_path)
-                if not camera_prim.IsValid():
-                    carb.log_error(f"💥 Camera not found: {camera_path}")
-                    return
-                
-                camera = UsdGeom.Camera(camera_prim)
-                xform = UsdGeom.Xformable(camera_prim)
-                
-                # 获取现有的 xformOp
-                xform_ops = xform.GetOrderedXformOps()
-                translate_op = None
-                orient_op = None
-                
-                for op in xform_ops:
-                    if op.GetOpType() == UsdGeom.XformOp.TypeTranslate:
-                        translate_op = op
-                    elif op.GetOpType() == UsdGeom.XformOp.TypeOrient:
-                        orient_op = op
-                
-                # 如果操作不存在，则创建
-                if not translate_op:
-                    translate_op = xform.AddTranslateOp()
-                if not orient_op:
-                    orient_op = xform.AddOrientOp()
-                
-                # 根据实验ID设置相机参数
-                if experiment_id == "1":
-                    # 实验1相机参数
-                    translate_op.Set(Gf.Vec3d(3.5422114387995194, 4.789534293747461, 2.734575842472313))
-                    orient_op.Set(Gf.Quatd(0.2293882119384616, 0.14807866885692916, 0.5217433897762196, 0.8082311496583482))
-                    carb.log_warn("📷 Applied camera params for Experiment 1")
-                elif experiment_id == "2":
-                    # 实验2相机参数
-                    translate_op.Set(Gf.Vec3d(1.169913776980235, 5.384567671926622, 2.5526077469676727))
-                    orient_op.Set(Gf.Quatd(0.014359612064957861, 0.009788101829553237, 0.5631514231667778, 0.8261709684981379))
-                    carb.log_warn("📷 Applied camera params for Experiment 2")
-                else:
-                    carb.log_warn(f"⚠️ No camera params defined for experiment {experiment_id}, using default")
-                
-                # 设置通用相机参数
-                camera.GetClippingRangeAttr().Set(Gf.Vec2f(0.009999999776482582, 10000000.0))
-                camera.GetFocalLengthAttr().Set(18.14756202697754)
-                
+
+                # 切换到对应实验的相机
+                await self._switch_camera(exp_id, stage)
+
+                # 根据实验编号应用对应的参数
+                await self._apply_exp_params(exp_id, stage)
+            future.set_result(None)
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # 没有等待者时避免 "exception was never retrieved" 警告
+            raise
+        finally:
+            # 领头任务被取消时（如客户端断开）CancelledError 不会进入上面的分支，
+            # 这里取消 future，避免其他等待者永远挂起
+            if not future.done():
+                future.cancel()
+            self._enter_inflight.pop(exp_id, None)
+
+    def _switch_camera_sync(self, experiment_id: str, stage=None):
+        """同步切换相机（在主线程中执行）"""
+        try:
+            if apply_camera_preset(experiment_id, stage):
                 carb.log_warn(f"✅ Camera switched to experiment {experiment_id}")
-            else:
-                carb.log_warn(f"⚠️ Camera script not found: {camera_script}")
         except Exception as e:
             carb.log_error(f"💥 Failed to switch camera: {e}")
             import traceback
             traceback.print_exc()
 
-    async def _switch_camera(self, experiment_id: str):
+    async def _switch_camera(self, experiment_id: str, stage=None):
         """切换到指定实验的相机配置"""
         # 直接调用同步版本
-        self._switch_camera_sync(experiment_id)
+        self._switch_camera_sync(experiment_id, stage)
 
-    async def _set_initial_angular_velocity(self):
+    def _set_initial_angular_velocity(self):
         """设置 disk 的初始角速度"""
         try:
             import math
@@ -839,8 +948,8 @@ class WebRTCServer:
             # 转换公式：度/秒 = rad/s × 180/π
             stage = omni.usd.get_context().get_stage()
             if stage:
-                disk_prim = stage.GetPrimAtPath("/World/exp1/disk")
-                if disk_prim and disk_prim.IsValid() and disk_prim.HasAPI(UsdPhysics.RigidBodyAPI):
+                disk_prim = self._get_exp1_prim(stage, "/World/exp1/disk")
+                if disk_prim and disk_prim.HasAPI(UsdPhysics.RigidBodyAPI):
                     rb_api = UsdPhysics.RigidBodyAPI(disk_prim)
                     # rad/s 转换为 度/秒: 乘以 180/π，缩放因子改为 10
                     SCALE_FACTOR = 10.0
@@ -868,23 +977,20 @@ class WebRTCServer:
         except Exception as e:
             carb.log_error(f"💥 Failed to reset positions: {e}")
 
-    async def _apply_exp1_params(self):
+    def _apply_exp1_params(self, stage=None):
         """只设置质量（其他使用 USD 默认值）"""
         try:
-            stage = omni.usd.get_context().get_stage()
+            stage = stage or omni.usd.get_context().get_stage()
             if not stage:
                 carb.log_warn("⚠️ No stage found, cannot apply params")
                 return
 
             paths_and_masses = [("/World/exp1/disk", self.exp1_disk_mass), ("/World/exp1/ring", self.exp1_ring_mass)]
             for path, mass in paths_and_masses:
-                prim = stage.GetPrimAtPath(path)
-                if prim and prim.IsValid():
+                mass_attr = self._get_exp1_mass_attr(stage, path)
+                if mass_attr:
                     # 只设置质量
-                    if not prim.HasAPI(UsdPhysics.MassAPI):
-                        UsdPhysics.MassAPI.Apply(prim)
-                    mass_api = UsdPhysics.MassAPI(prim)
-                    mass_api.GetMassAttr().Set(float(mass))
+                    mass_attr.Set(float(mass))
                     carb.log_warn(f"✅ Set mass for {path}: {mass}kg")
                 else:
                     carb.log_warn(f"⚠️ Prim not found: {path}")
@@ -895,7 +1001,38 @@ class WebRTCServer:
             import traceback
             traceback.print_exc()
 
-    async def _apply_exp2_params(self):
+    async def _apply_exp_params(self, exp_id: str, stage=None):
+        """按实验编号应用参数，未注册的实验直接返回"""
+        handler = self._exp_param_handlers.get(exp_id)
+        if handler is None:
+            return
+        result = handler(stage)
+        if asyncio.iscoroutine(result):
+            await result
+
+    async def _stop_timeline_and_wait(self, tl, timeout: float = 0.1):
+        """停止 timeline，并等待 STOP 事件（最多等待 timeout 秒）
+
+        STOP 事件在下一次应用更新时分发，通常远早于固定等待时间
+        """
+        future = asyncio.get_event_loop().create_future()
+
+        def _on_stop(event):
+            if not future.done():
+                future.set_result(None)
+
+        sub = tl.get_timeline_event_stream().create_subscription_to_pop_by_type(
+            int(omni.timeline.TimelineEventType.STOP), _on_stop
+        )
+        try:
+            tl.stop()
+            await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            sub = None
+
+    async def _apply_exp2_params(self, stage=None):
         """设置实验2的参数：质量和初始角度
 
         只设置用户要求的4个功能相关的参数：
@@ -907,7 +1044,7 @@ class WebRTCServer:
         注意：不修改阻尼、摩擦、关节驱动等物理参数，保持USD原始配置
         """
         try:
-            stage = omni.usd.get_context().get_stage()
+            stage = stage or omni.usd.get_context().get_stage()
             if not stage:
                 carb.log_warn("⚠️ [Exp2] No stage found, cannot apply params")
                 return
@@ -918,19 +1055,21 @@ class WebRTCServer:
 
             # 确保在停止状态下设置角度
             if was_playing:
-                tl.stop()
-                await asyncio.sleep(0.1)  # 等待停止完成
+                await self._stop_timeline_and_wait(tl)
 
             # 设置 Group_01 的旋转角度
             group_prim = stage.GetPrimAtPath(config.EXP2_GROUP_PATH)
-            if group_prim and group_prim.IsValid():
+            if group_prim:
                 xformable = UsdGeom.Xformable(group_prim)
 
-                # 清除现有的旋转操作
-                xformable.ClearXformOpOrder()
-
-                # 添加新的旋转操作（绕Y轴）
-                rotate_op = xformable.AddRotateYOp()
+                # 已经只剩一个绕Y轴的旋转操作时直接复用，避免每次清除重建
+                xform_ops = xformable.GetOrderedXformOps()
+                if len(xform_ops) == 1 and xform_ops[0].GetOpType() == UsdGeom.XformOp.TypeRotateY:
+                    rotate_op = xform_ops[0]
+                else:
+                    # 清除现有的变换操作，添加新的旋转操作（绕Y轴）
+                    xformable.ClearXformOpOrder()
+                    rotate_op = xformable.AddRotateYOp()
                 rotate_op.Set(float(self.exp2_initial_angle))
 
                 carb.log_warn(f"✅ [Exp2] Set initial angle: {self.exp2_initial_angle}°")
@@ -944,7 +1083,7 @@ class WebRTCServer:
             ]
             for path, mass, name in mass_paths:
                 prim = stage.GetPrimAtPath(path)
-                if prim and prim.IsValid():
+                if prim:
                     # 只设置质量，不修改其他物理属性
                     if not prim.HasAPI(UsdPhysics.MassAPI):
                         UsdPhysics.MassAPI.Apply(prim)
@@ -963,15 +1102,29 @@ class WebRTCServer:
             traceback.print_exc()
     
     def _get_actual_angular_velocities(self):
-        """从物理仿真中读取实际的角速度"""
+        """从物理仿真中读取实际的角速度
+
+        物理状态只在 timeline 前进时变化，同一时刻的重复调用直接返回上次结果
+        """
+        t = omni.timeline.get_timeline_interface().get_current_time()
+        if t == self._last_vel_time:
+            return self._last_vel
+
+        self._last_vel = self._read_actual_angular_velocities()
+        self._last_vel_time = t
+        return self._last_vel
+
+    def _read_actual_angular_velocities(self):
+        """依次尝试 DC / RigidPrim / USD 读取 (disk, ring) 角速度"""
         disk_vel = 0.0
         ring_vel = 0.0
         
         try:
             # 方法1: 尝试使用 Dynamic Control API
             try:
-                from omni.isaac.dynamic_control import _dynamic_control
-                
+                if _dynamic_control is None:
+                    raise ImportError("Dynamic Control not available")
+
                 if self._dc_interface is None:
                     self._dc_interface = _dynamic_control.acquire_dynamic_control_interface()
                 
@@ -979,17 +1132,18 @@ class WebRTCServer:
                 
                 SCALE_FACTOR = 10.0
                 
+                # 使用缓存的刚体句柄，避免每次按路径查找
+                disk_handle, ring_handle = self._get_exp1_rb_handles(dc)
+
                 # 读取 disk 的角速度
-                disk_handle = dc.get_rigid_body("/World/exp1/disk")
-                if disk_handle != _dynamic_control.INVALID_HANDLE:
+                if disk_handle != _DC_INVALID_HANDLE:
                     ang_vel = dc.get_rigid_body_angular_velocity(disk_handle)
                     if ang_vel is not None:
                         # Dynamic Control 返回 rad/s，除以 SCALE_FACTOR 还原缩放
                         disk_vel = float(ang_vel[2]) / SCALE_FACTOR
                 
                 # 读取 ring 的角速度
-                ring_handle = dc.get_rigid_body("/World/exp1/ring")
-                if ring_handle != _dynamic_control.INVALID_HANDLE:
+                if ring_handle != _DC_INVALID_HANDLE:
                     ang_vel = dc.get_rigid_body_angular_velocity(ring_handle)
                     if ang_vel is not None:
                         ring_vel = float(ang_vel[2]) / SCALE_FACTOR
@@ -1023,7 +1177,7 @@ class WebRTCServer:
                 import math
                 SCALE_FACTOR = 10.0
                 disk_prim = stage.GetPrimAtPath("/World/exp1/disk")
-                if disk_prim and disk_prim.IsValid() and disk_prim.HasAPI(UsdPhysics.RigidBodyAPI):
+                if disk_prim and disk_prim.HasAPI(UsdPhysics.RigidBodyAPI):
                     rb_api = UsdPhysics.RigidBodyAPI(disk_prim)
                     vel_attr = rb_api.GetAngularVelocityAttr()
                     if vel_attr and vel_attr.Get():
@@ -1031,7 +1185,7 @@ class WebRTCServer:
                         disk_vel = float(vel[2]) * (math.pi / 180.0) / SCALE_FACTOR if vel else 0.0
                 
                 ring_prim = stage.GetPrimAtPath("/World/exp1/ring")
-                if ring_prim and ring_prim.IsValid() and ring_prim.HasAPI(UsdPhysics.RigidBodyAPI):
+                if ring_prim and ring_prim.HasAPI(UsdPhysics.RigidBodyAPI):
                     rb_api = UsdPhysics.RigidBodyAPI(ring_prim)
                     vel_attr = rb_api.GetAngularVelocityAttr()
                     if vel_attr and vel_attr.Get():
@@ -1071,21 +1225,15 @@ class WebRTCServer:
                     # 直接使用 Y 轴角度（用户测试验证正确）
                     angle_deg = float(euler_xyz[1])
 
-                    if not hasattr(self, '_method_logged'):
-                        carb.log_warn("✅ [Exp2] Using RigidPrim + scipy (user verified)")
-                        self._method_logged = True
+                    log_warn_once("exp2_method", "✅ [Exp2] Using RigidPrim + scipy (user verified)")
 
             except ImportError:
                 # scipy 不可用，回退到 USD API
-                if not hasattr(self, '_scipy_warn_logged'):
-                    carb.log_warn("⚠️ [Exp2] scipy not available, using USD fallback")
-                    self._scipy_warn_logged = True
+                log_warn_once("exp2_scipy_missing", "⚠️ [Exp2] scipy not available, using USD fallback")
                 angle_deg = self._get_exp2_angle_fallback()
 
             except Exception as e:
-                if not hasattr(self, '_rigidprim_error_logged'):
-                    carb.log_warn(f"⚠️ [Exp2] RigidPrim failed: {e}, using fallback")
-                    self._rigidprim_error_logged = True
+                log_warn_once("exp2_rigidprim_error", f"⚠️ [Exp2] RigidPrim failed: {e}, using fallback")
                 angle_deg = self._get_exp2_angle_fallback()
 
             # 如果所有方法都失败
@@ -1120,7 +1268,7 @@ class WebRTCServer:
             cylinder_prim = stage.GetPrimAtPath(config.EXP2_CYLINDER_PATH)
             group_prim = stage.GetPrimAtPath(config.EXP2_GROUP_PATH)
 
-            if not (cylinder_prim and cylinder_prim.IsValid() and group_prim and group_prim.IsValid()):
+            if not (cylinder_prim and group_prim):
                 return 0.0
 
             cylinder_xform = UsdGeom.Xformable(cylinder_prim)
@@ -1209,10 +1357,50 @@ class WebRTCServer:
             traceback.print_exc()
             return self.exp2_period
 
+    async def _telemetry_sender(self, ws):
+        """单个客户端的遥测发送任务：每次发送完成后发送槽位中最新的消息，槽位为空时退出"""
+        latest = self._telemetry_latest
+        while True:
+            payload = latest.pop(ws, None)
+            if payload is None:
+                return
+            try:
+                await ws.send_str(payload)
+            except Exception as e:
+                latest.pop(ws, None)
+                if ws not in self._telemetry_send_failed:
+                    self._telemetry_send_failed.add(ws)
+                    carb.log_warn(f"⚠️ Telemetry send failed: {e}")
+                return
+
+    def _broadcast_telemetry_batch(self, batch):
+        """将一批遥测样本合并为一条 telemetry_batch 消息，后台发送给所有客户端"""
+        # 只序列化一次，所有客户端共用同一个字符串
+        payload = dumps_json({"type": "telemetry_batch", "data": batch})
+        # 后台发送，不阻塞遥测循环；客户端上一批尚未发完时用本批覆盖待发送的旧批次，
+        # 慢速连接总是在当前发送完成后收到最新数据，而不会拖慢采样节奏
+        for ws in list(self.ws_clients):
+            if ws.closed:
+                continue
+            self._telemetry_latest[ws] = payload
+            sender = self._telemetry_senders.get(ws)
+            if sender is None or sender.done():
+                self._telemetry_senders[ws] = asyncio.ensure_future(self._telemetry_sender(ws))
+
     async def _simulation_state_monitor(self):
+        # 待发送的遥测样本及第一个样本的采集时间
+        batch = []
+        batch_start = 0.0
+        # 当前批次所属的实验（切换实验时先发送旧批次，避免一条消息混合两个实验的样本）
+        batch_experiment = None
+        # 下一次采样的截止时间（单调时钟）
+        next_deadline = time.monotonic()
+        # timeline 接口是单例，循环外获取一次
+        tl = omni.timeline.get_timeline_interface()
         while True:
             try:
-                tl = omni.timeline.get_timeline_interface()
+                # 每个周期只读取一次播放状态，各分支复用
+                is_playing = tl.is_playing()
 
                 # 始终发送遥测数据（无论仿真是否运行）
                 if self.ws_clients:
@@ -1222,7 +1410,7 @@ class WebRTCServer:
                     if self.current_experiment == "1":
                         # 实验1：角动量守恒
                         disk_vel, ring_vel = 0.0, 0.0
-                        if tl.is_playing():
+                        if is_playing:
                             disk_vel, ring_vel = self._get_actual_angular_velocities()
 
                         # 保留两位小数精度
@@ -1232,24 +1420,21 @@ class WebRTCServer:
                         # 计算角动量 L = I * ω
                         angular_momentum = round(self.exp1_disk_mass * disk_vel + self.exp1_ring_mass * ring_vel, 2)
 
-                        msg = {
-                            "type": "telemetry",
-                            "data": {
-                                "timestamp": current_time,
-                                "disk_angular_velocity": disk_vel,
-                                "ring_angular_velocity": ring_vel,
-                                "angular_momentum": angular_momentum,
-                                "disk_mass": self.exp1_disk_mass,
-                                "ring_mass": self.exp1_ring_mass,
-                                "initial_velocity": round(self.exp1_initial_vel, 2),
-                                "is_running": tl.is_playing()
-                            }
+                        sample = {
+                            "timestamp": current_time,
+                            "disk_angular_velocity": disk_vel,
+                            "ring_angular_velocity": ring_vel,
+                            "angular_momentum": angular_momentum,
+                            "disk_mass": self.exp1_disk_mass,
+                            "ring_mass": self.exp1_ring_mass,
+                            "initial_velocity": round(self.exp1_initial_vel, 2),
+                            "is_running": is_playing
                         }
                     elif self.current_experiment == "2":
                         # 实验2：大角度单摆（角度单位：度）
                         angle = 0.0
                         period = 0.0
-                        if tl.is_playing():
+                        if is_playing:
                             angle = self._get_exp2_angle()
                             period = self._calculate_exp2_period(angle, current_time)
 
@@ -1258,40 +1443,54 @@ class WebRTCServer:
                         period = round(period, 2)
 
                         # 调试日志：每5秒打印一次角度值
-                        if not hasattr(self, '_last_angle_log_time'):
-                            self._last_angle_log_time = 0
                         if current_time - self._last_angle_log_time >= 5.0:
                             carb.log_warn(f"📊 [Exp2 Telemetry] Angle={angle}° (range should be -180 to 180)")
                             self._last_angle_log_time = current_time
 
-                        msg = {
-                            "type": "telemetry",
-                            "data": {
-                                "timestamp": current_time,
-                                "angle": angle,
-                                "period": period,
-                                "initial_angle": self.exp2_initial_angle,
-                                "mass1": self.exp2_mass1,
-                                "mass2": self.exp2_mass2,
-                                "is_running": tl.is_playing()
-                            }
+                        sample = {
+                            "timestamp": current_time,
+                            "angle": angle,
+                            "period": period,
+                            "initial_angle": self.exp2_initial_angle,
+                            "mass1": self.exp2_mass1,
+                            "mass2": self.exp2_mass2,
+                            "is_running": is_playing
                         }
                     else:
                         # 默认发送空数据
-                        msg = {
-                            "type": "telemetry",
-                            "data": {
-                                "timestamp": current_time,
-                                "is_running": tl.is_playing()
-                            }
+                        sample = {
+                            "timestamp": current_time,
+                            "is_running": is_playing
                         }
 
-                    for ws in list(self.ws_clients):
-                        if not ws.closed:
-                            await ws.send_json(msg)
+                    if batch and batch_experiment != self.current_experiment:
+                        self._broadcast_telemetry_batch(batch)
+                        batch = []
+                    if not batch:
+                        batch_start = current_time
+                        batch_experiment = self.current_experiment
+                    batch.append(sample)
+
+                    # 样本数或等待时间达到上限时合并为一条消息发送；未播放时每个样本立即发送
+                    if (
+                        not is_playing
+                        or len(batch) >= config.TELEMETRY_MAX_BATCH
+                        or current_time - batch_start >= config.TELEMETRY_MAX_DELAY
+                    ):
+                        self._broadcast_telemetry_batch(batch)
+                        batch = []
+                elif batch:
+                    # 所有客户端都已断开，丢弃未发送的样本
+                    batch = []
             except Exception as e:
                 carb.log_warn(f"⚠️ Telemetry error: {e}")
-            await asyncio.sleep(config.TELEMETRY_BROADCAST_INTERVAL)
+
+            # 按固定相位休眠到下一个截止时间（扣除本次处理耗时）；落后超过一个周期时跳过错过的采样
+            next_deadline += config.TELEMETRY_BROADCAST_INTERVAL
+            now = time.monotonic()
+            if next_deadline < now:
+                next_deadline = now + config.TELEMETRY_BROADCAST_INTERVAL
+            await asyncio.sleep(next_deadline - now)
 
     async def start(self):
         if not HAS_WEBRTC: return
@@ -0,0 +1,57 @@
+"""
+WebRTCServer._enter_experiment 并发合并测试（需要 Isaac Sim 环境）
+"""
+import asyncio
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("carb")
+pytest.importorskip("omni.usd")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from isaac_webrtc_server import WebRTCServer
+
+
+def _make_server():
+    """只初始化 _enter_experiment 用到的状态，不启动相机、timeline 订阅等"""
+    server = WebRTCServer.__new__(WebRTCServer)
+    server._enter_lock = asyncio.Lock()
+    server._enter_inflight = {}
+    server.current_experiment = None
+    server._invalidate_exp1_cache = lambda: None
+    return server
+
+
+def test_cancelled_leader_releases_waiters():
+    async def scenario():
+        server = _make_server()
+        entered = asyncio.Event()
+
+        async def blocking_switch_camera(exp_id, stage=None):
+            entered.set()
+            await asyncio.Event().wait()
+
+        async def apply_exp_params(exp_id, stage=None):
+            pass
+
+        server._switch_camera = blocking_switch_camera
+        server._apply_exp_params = apply_exp_params
+
+        leader = asyncio.ensure_future(server._enter_experiment("1"))
+        await entered.wait()
+        waiter = asyncio.ensure_future(server._enter_experiment("1"))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+        # 等待者必须随领头任务一起结束，而不是永远挂起
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(waiter, 1.0)
+        assert server._enter_inflight == {}
+
+    asyncio.run(scenario())
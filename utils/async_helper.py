@@ -3,6 +3,7 @@
 改进线程安全处理
 """
 import asyncio
+import time
 from typing import Optional
 import carb
 
@@ -107,7 +108,7 @@ class AsyncLock:
         """
         try:
             await asyncio.wait_for(self._lock.acquire(), timeout=self.timeout)
-            self._acquired_time = asyncio.get_event_loop().time()
+            self._acquired_time = time.monotonic()
             return True
         except asyncio.TimeoutError:
             carb.log_error(f"[{self.name}] Failed to acquire lock after {self.timeout}s")
@@ -116,7 +117,7 @@ class AsyncLock:
     def release(self):
         """释放锁"""
         if self._acquired_time is not None:
-            elapsed = asyncio.get_event_loop().time() - self._acquired_time
+            elapsed = time.monotonic() - self._acquired_time
             if elapsed > 5.0:  # 如果锁持有超过5秒，记录警告
                 carb.log_warn(f"[{self.name}] Lock held for {elapsed:.2f}s")
             self._acquired_time = None
@@ -0,0 +1,74 @@
+"""
+帧数据转换内核
+将 Replicator 返回的浮点图像一次遍历转换为 uint8 RGB，安装了 numba 时编译为并行内核
+"""
+import numpy as np
+from typing import Optional
+
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+if HAS_NUMBA:
+    # 不开启 nnan/ninf：内核依赖 x - x 检测非有限值，这两个标志会让编译器删掉该判断
+    @njit(parallel=True, fastmath={"nsz", "arcp", "contract", "afn", "reassoc"}, cache=True)
+    def _float_to_u8_rgb_kernel(src, dst):
+        height, width = dst.shape[0], dst.shape[1]
+        bad = 0
+        for i in prange(height):
+            for j in range(width):
+                for c in range(3):
+                    x = src[i, j, c]
+                    if x - x != 0.0:
+                        # 有限值 x - x 恒为 0，NaN/Inf 得到 NaN：一次比较同时识别三种情况
+                        # +Inf -> 255，NaN/-Inf -> 0
+                        v = 255 if x > 0.0 else 0
+                        bad += 1
+                    elif x >= 1.0:
+                        v = 255
+                    elif x <= 0.0:
+                        v = 0
+                    else:
+                        v = int(x * 255.0)
+                    dst[i, j, c] = v
+        return bad
+
+
+def float_to_u8_rgb(src: np.ndarray, dst: np.ndarray, scratch: Optional[np.ndarray] = None) -> int:
+    """
+    将 [0, 1] 范围的浮点图像转换为 uint8 RGB，写入 dst
+
+    NaN 置为 0，+Inf 置为 255，-Inf 置为 0，其余值乘 255 后截断到 [0, 255]；
+    多于 3 个通道时（如 RGBA）只取前 3 个
+
+    Args:
+        src: (H, W, C) float32/float64 图像，C >= 3
+        dst: 预分配的 (H, W, 3) uint8 连续数组
+        scratch: 可选的 (H, W, 3) 浮点暂存数组，未安装 numba 时用于存放中间结果，
+            避免每帧分配临时数组
+
+    Returns:
+        NaN/Inf 值的个数（未安装 numba 时不统计，始终返回 0）
+    """
+    if HAS_NUMBA:
+        return _float_to_u8_rgb_kernel(src, dst)
+
+    # fmax/fmin 遇到 NaN 时返回另一个参数，因此 NaN -> 0、+Inf -> 255、-Inf -> 0，
+    # 不需要单独的 isnan/isinf 扫描和 nan_to_num 副本；为避免额外遍历整帧，这里不统计非有限值
+    rgb = src[:, :, :3]
+    if scratch is not None and scratch.shape == dst.shape:
+        scaled = np.multiply(rgb, 255.0, out=scratch, casting="same_kind")
+    else:
+        scaled = rgb * 255.0
+    np.fmax(scaled, 0.0, out=scaled)
+    np.fmin(scaled, 255.0, out=scaled)
+    np.copyto(dst, scaled, casting="unsafe")
+    return 0
+
+
+# 导入时编译（或从缓存加载），避免第一帧承担编译耗时
+if HAS_NUMBA:
+    _float_to_u8_rgb_kernel(np.zeros((2, 2, 4), dtype=np.float32), np.empty((2, 2, 3), dtype=np.uint8))
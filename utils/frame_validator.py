@@ -12,6 +12,12 @@ try:
 except ImportError:
     HAS_PIL = False
 
+try:
+    import cv2
+    HAS_CV2 = True
+except ImportError:
+    HAS_CV2 = False
+
 
 class FrameValidator:
     """
@@ -32,6 +38,10 @@ class FrameValidator:
         self._error_count = 0
         self._max_error_log = 5
 
+        # 测试图案和纯色帧内容固定，首次生成后缓存复用（只读）
+        self._test_pattern = None
+        self._blank_frames = {}
+
     def validate_and_fix(self, frame: np.ndarray) -> Optional[np.ndarray]:
         """
         验证并修复帧数据
@@ -140,8 +150,12 @@ class FrameValidator:
         if h == self.height and w == self.width:
             return frame
 
+        # 优先使用 OpenCV 的 SIMD 双线性缩放，不可用时回退到 PIL
+        if HAS_CV2:
+            return cv2.resize(frame, (self.width, self.height), interpolation=cv2.INTER_LINEAR)
+
         if not HAS_PIL:
-            raise RuntimeError("PIL is required for frame resizing")
+            raise RuntimeError("PIL or OpenCV is required for frame resizing")
 
         img = Image.fromarray(frame)
         img = img.resize((self.width, self.height), Image.BILINEAR)
@@ -154,7 +168,10 @@ class FrameValidator:
             carb.log_error(f"[FrameValidator] {message} (#{self._error_count})")
 
     def generate_test_pattern(self) -> np.ndarray:
-        """生成彩色条纹测试图案"""
+        """生成彩色条纹测试图案（返回缓存的只读数组）"""
+        if self._test_pattern is not None:
+            return self._test_pattern
+
         frame = np.zeros((self.height, self.width, 3), dtype=np.uint8)
         stripe_width = self.width // 7
 
@@ -173,15 +190,21 @@ class FrameValidator:
             x_end = min((i + 1) * stripe_width, self.width)
             frame[:, x_start:x_end] = color
 
+        frame.flags.writeable = False
+        self._test_pattern = frame
         return frame
 
     def generate_blank_frame(self, color: Tuple[int, int, int] = (0, 128, 0)) -> np.ndarray:
         """
-        生成纯色帧
+        生成纯色帧（每种颜色缓存一个只读数组）
 
         Args:
             color: RGB颜色 (默认为绿色)
         """
-        frame = np.zeros((self.height, self.width, 3), dtype=np.uint8)
-        frame[:, :] = color
+        frame = self._blank_frames.get(color)
+        if frame is None:
+            frame = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+            frame[:, :] = color
+            frame.flags.writeable = False
+            self._blank_frames[color] = frame
         return frame
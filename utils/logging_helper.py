@@ -34,6 +34,9 @@ class SmartLogger:
         self._stats_interval = 60.0  # 每60秒输出一次统计
         self._last_stats_time = time.time()
 
+        # 已通过 log_once 记录过的 key
+        self._logged_once = set()
+
     def _get_error_key(self, message: str, level: str) -> str:
         """生成错误的唯一标识"""
         # 使用消息的前100个字符作为key，避免参数变化导致的key不同
@@ -122,6 +125,27 @@ class SmartLogger:
             import traceback
             carb.log_error(traceback.format_exc())
 
+    def log_once(self, key: str, message: str, level: str = "warn", exc_info: bool = False):
+        """
+        同一 key 只记录一次（用于"首次成功"、"已回退到备用方案"等提示）
+
+        Args:
+            key: 去重标识
+            message: 日志内容
+            level: info / warn / error
+            exc_info: 仅 error 级别有效，附带异常堆栈
+        """
+        if key in self._logged_once:
+            return
+        self._logged_once.add(key)
+
+        if level == "error":
+            self.error(message, suppress=False, exc_info=exc_info)
+        elif level == "info":
+            self.info(message, suppress=False)
+        else:
+            self.warn(message, suppress=False)
+
     def print_stats(self):
         """输出错误统计信息"""
         current_time = time.time()